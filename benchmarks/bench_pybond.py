@@ -0,0 +1,194 @@
+"""
+Benchmarks for pybond's spy/stub overhead and setup cost.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_pybond [--quick] [--output results.json]
+
+Results are emitted as a JSON document with one entry per measurement, so they
+can be tracked over time.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+import types
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from pybond import (
+    called_exactly_once_with_args,
+    called_with_args,
+    spy,
+    stub,
+    times_called,
+)
+
+_BENCHMARK_MODULE_PREFIX = "_pybond_benchmark_module_"
+
+
+def _best_of(stmt, number: int, repeat: int) -> float:
+    """Returns the best time per execution of `stmt`, in nanoseconds."""
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number * 1e9
+
+
+def _target(*args, **kwargs):
+    return None
+
+
+@contextmanager
+def _synthetic_modules(n_modules: int, n_targets: int):
+    """
+    Registers `n_modules` modules in `sys.modules`, the first of which defines
+    `n_targets` functions. Every other module imports all of them with
+    `from ... import ...`.
+    """
+    names = [f"{_BENCHMARK_MODULE_PREFIX}{i}" for i in range(n_modules)]
+    modules = []
+    for name in names:
+        module = types.ModuleType(name)
+        module.__loader__ = None
+        modules.append(module)
+    source = "\n".join(
+        f"def target_{i}(x):\n    return x\n" for i in range(n_targets)
+    )
+    exec(source, vars(modules[0]))
+    targets = [getattr(modules[0], f"target_{i}") for i in range(n_targets)]
+    for module in modules[1:]:
+        for target in targets:
+            setattr(module, target.__name__, target)
+    sys.modules.update(zip(names, modules))
+    try:
+        yield targets
+    finally:
+        for name in names:
+            del sys.modules[name]
+
+
+def bench_call_overhead(number: int, repeat: int) -> list[dict]:
+    this_module = sys.modules[__name__]
+    shapes = {
+        "no_args": ((), {}),
+        "scalars": ((1, 2.0, "three"), {}),
+        "kwargs": ((), {"a": 1, "b": 2, "c": 3}),
+        "large_dict": (({i: str(i) for i in range(1000)},), {}),
+    }
+    results = []
+    for shape, (args, kwargs) in shapes.items():
+        baseline = _best_of(lambda: _target(*args, **kwargs), number, repeat)
+        results.append(
+            {
+                "benchmark": "call_overhead",
+                "shape": shape,
+                "mode": "unspied",
+                "ns_per_call": baseline,
+            }
+        )
+        for capture in ["deep", "shallow", "reference", "none"]:
+            with spy(this_module._target, capture=capture, max_calls=1):
+                spied = this_module._target
+                ns = _best_of(lambda: spied(*args, **kwargs), number, repeat)
+            results.append(
+                {
+                    "benchmark": "call_overhead",
+                    "shape": shape,
+                    "mode": f"capture={capture}",
+                    "ns_per_call": ns,
+                    "overhead_ns_per_call": ns - baseline,
+                }
+            )
+    return results
+
+
+def bench_stub_setup(repeat: int, sizes: list[int]) -> list[dict]:
+    results = []
+    for heap_size in sizes:
+        heap = [{"i": i} for i in range(heap_size)]  # noqa: F841
+        for n_modules in [10, 100]:
+            for n_targets in [1, 10]:
+                with _synthetic_modules(n_modules, n_targets) as targets:
+                    stubs = [(t, lambda x: None) for t in targets]
+
+                    def enter_and_exit():
+                        with stub(*stubs):
+                            pass
+
+                    ns = _best_of(enter_and_exit, 1, repeat)
+                results.append(
+                    {
+                        "benchmark": "stub_setup",
+                        "heap_objects": heap_size,
+                        "modules": n_modules,
+                        "targets": n_targets,
+                        "ns_per_enter_exit": ns,
+                    }
+                )
+        del heap
+    return results
+
+
+def bench_assertions(repeat: int, sizes: list[int]) -> list[dict]:
+    this_module = sys.modules[__name__]
+    assertions = {
+        "times_called": lambda f, n: times_called(f, n),
+        "called_with_args": lambda f, n: called_with_args(f, args=[n - 1]),
+        "called_exactly_once_with_args": (
+            lambda f, n: called_exactly_once_with_args(f, args=[n - 1])
+        ),
+    }
+    results = []
+    for n_calls in sizes:
+        for name, assertion in assertions.items():
+            # A fresh spy per assertion, so that the first call pays for
+            # building the call log's indexes, and the later ones do not
+            with spy(this_module._target):
+                spied = this_module._target
+                for i in range(n_calls):
+                    spied(i)
+                first_ns = _best_of(lambda: assertion(spied, n_calls), 1, 1)
+                ns = _best_of(lambda: assertion(spied, n_calls), 1, repeat)
+            results.append(
+                {
+                    "benchmark": "assertion",
+                    "assertion": name,
+                    "calls": n_calls,
+                    "ns_first_assertion": first_ns,
+                    "ns_per_assertion": ns,
+                }
+            )
+    return results
+
+
+def run(quick: bool = False) -> dict:
+    number, repeat = (1_000, 3) if quick else (20_000, 5)
+    heap_sizes = [0, 100_000] if quick else [0, 100_000, 1_000_000]
+    log_sizes = [1_000, 10_000] if quick else [1_000, 10_000, 100_000]
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "results": (
+            bench_call_overhead(number, repeat)
+            + bench_stub_setup(repeat, heap_sizes)
+            + bench_assertions(repeat, log_sizes)
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument("--output", help="Write results to a file")
+    options = parser.parse_args()
+    results = json.dumps(run(options.quick), indent=2)
+    if options.output:
+        with open(options.output, "w") as file:
+            file.write(results + "\n")
+    else:
+        print(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,25 @@ from pybond.assertions import (
     called_exactly_once_with_args,
     called_with_args,
     called_with_exact_args_list,
+    called_with_matching,
+    called_within,
     times_called,
     was_called,
 )
-from pybond.james import calls, spy, stub
+from pybond.james import StubPlan, calls, column, latency, spy, stub
+from pybond.query import query
 
 __all__ = [
+    "StubPlan",
     "called_exactly_once_with_args",
     "called_with_args",
     "called_with_exact_args_list",
+    "called_with_matching",
+    "called_within",
     "calls",
+    "column",
+    "latency",
+    "query",
     "spy",
     "stub",
     "times_called",
@@ -1,4 +1,19 @@
-from pybond.james import calls
+from inspect import ismethod
+from itertools import zip_longest
+
+from pybond.james import call_log, latency
+from pybond.query import query
+
+
+def _times_called(f):
+    # Calls of methods bound to an instance are filtered by receiver
+    if ismethod(f):
+        return query(f).count()
+    return call_log(f).total
+
+
+def _count_calls_with(f, field, value):
+    return query(f).where(**{field: value}).count()
 
 
 def was_called(f):
@@ -6,7 +21,7 @@ def was_called(f):
     A predicate to check if `f` was called at least 1 time. Note that `f` must
     be a spied function.
     """
-    return len(calls(f)) > 0
+    return _times_called(f) > 0
 
 
 def times_called(f, n):
@@ -14,7 +29,15 @@ def times_called(f, n):
     A predicate to check if `f` was called exactly `n` times. Note that `f` must
     be a spied function.
     """
-    return len(calls(f)) == n
+    return _times_called(f) == n
+
+
+def _equal_lists(items, expected):
+    # Compares lazily, stopping at the first difference
+    if not isinstance(expected, list):
+        return False
+    pairs = zip_longest(items, expected, fillvalue=object())
+    return all(item == expected_item for item, expected_item in pairs)
 
 
 def called_with_exact_args_list(f, args_list=None, kwargs_list=None):
@@ -23,15 +46,18 @@ def called_with_exact_args_list(f, args_list=None, kwargs_list=None):
     only if arguments match for every function call on `f`. Note that `f` must
     be a spied function.
     """
-    fcalls = calls(f)
-    if len(fcalls) == 0:
+    fcalls = query(f)
+    if not fcalls.exists():
         return False
-    args_match = len(fcalls) > 0
-    kwargs_match = len(fcalls) > 0
+    args_match = True
+    kwargs_match = True
     if args_list is not None:
-        args_match = args_list == [fcall["args"] for fcall in fcalls]
+        args_match = _equal_lists(fcalls.map(lambda c: c["args"]), args_list)
     if kwargs_list is not None:
-        kwargs_match = kwargs_list == [fcall["kwargs"] for fcall in fcalls]
+        kwargs_match = _equal_lists(
+            fcalls.map(lambda c: c["kwargs"]),
+            kwargs_list,
+        )
     return args_match and kwargs_match
 
 
@@ -48,11 +74,32 @@ def called_with_args(f, args=None, kwargs=None):
     A predicate to check if `f` has been called at least once with the given
     arguments. Note that `f` must be a spied function.
     """
-    fcalls = calls(f)
-    args_match = len(fcalls) > 0
-    kwargs_match = len(fcalls) > 0
+    called = query(f).exists()
+    args_match = called
+    kwargs_match = called
     if args is not None:
-        args_match = args in [fcall["args"] for fcall in fcalls]
+        args_match = _count_calls_with(f, "args", args) > 0
     if kwargs is not None:
-        kwargs_match = kwargs in [fcall["kwargs"] for fcall in fcalls]
+        kwargs_match = _count_calls_with(f, "kwargs", kwargs) > 0
     return args_match and kwargs_match
+
+
+def called_with_matching(f, args=None, kwargs=None):
+    """
+    A predicate to check if `f` has been called at least once with arguments
+    matching the given patterns (see `pybond.matchers`). The patterns are
+    compiled once, and the calls are scanned until the first match. Note that
+    `f` must be a spied function.
+    """
+    return query(f).where(args=args, kwargs=kwargs).exists()
+
+
+def called_within(f, max_ns, percentile=100):
+    """
+    A predicate to check if the `percentile`-th percentile of the durations of
+    the recorded calls to `f` is at most `max_ns` nanoseconds. By default,
+    every recorded call must have completed within `max_ns`. Note that `f` must
+    be a spied function.
+    """
+    duration_ns = latency(f).percentile(percentile)
+    return duration_ns is not None and duration_ns <= max_ns
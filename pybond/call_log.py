@@ -0,0 +1,876 @@
+import os
+import pickle
+from array import array
+from collections import Counter, deque
+from functools import lru_cache
+from heapq import merge
+from itertools import count
+from os import PathLike
+from threading import Condition, Lock, Thread, local
+from typing import Any, Hashable, Iterable, Iterator
+from weakref import WeakSet
+
+from pybond.sinks import CallSink, as_sink, dumps_portable, portable_error
+from pybond.stats import LatencyHistogram
+from pybond.types import FunctionCall, RecordMode, TimedFunctionCall
+
+_UNHASHABLE = object()
+
+
+def _index_key(value: Any) -> Hashable:
+    """
+    Returns a hashable key which compares equal to the key of another value if
+    and only if both values compare equal, or `_UNHASHABLE`.
+    """
+    if isinstance(value, list):
+        key = (list, tuple(value))
+    elif isinstance(value, dict):
+        key = (dict, frozenset(value.items()))
+    else:
+        key = (object, value)
+    try:
+        hash(key)
+    except TypeError:
+        return _UNHASHABLE
+    return key
+
+
+class _FieldIndex:
+    """
+    Counts the hashable values of one field (`args` or `kwargs`) of the records
+    in a call log.
+    """
+
+    def __init__(self, field: str, records: Iterable[FunctionCall]):
+        self.field = field
+        self.counts: Counter = Counter()
+        self.unhashable = 0
+        for record in records:
+            self.add(record)
+
+    def add(self, record: FunctionCall) -> None:
+        key = _index_key(record[self.field])
+        if key is _UNHASHABLE:
+            self.unhashable += 1
+        else:
+            self.counts[key] += 1
+
+    def remove(self, record: FunctionCall) -> None:
+        key = _index_key(record[self.field])
+        if key is _UNHASHABLE:
+            self.unhashable -= 1
+        else:
+            self.counts[key] -= 1
+            if self.counts[key] == 0:
+                del self.counts[key]
+
+    def count(self, value: Any, records: Iterable[FunctionCall]) -> int:
+        key = _index_key(value)
+        if key is _UNHASHABLE or self.unhashable > 0:
+            # Fall back to a linear search when unhashable values are involved
+            return sum(1 for record in records if record[self.field] == value)
+        return self.counts[key]
+
+
+class CallLog:
+    """
+    The calls recorded by a spy. When `max_calls` is given, only the last
+    `max_calls` records are retained in a ring buffer, but the total number of
+    calls is always counted exactly.
+    """
+
+    def __init__(self, max_calls: int | None = None):
+        if max_calls is not None and max_calls < 1:
+            raise ValueError(
+                f"Invalid max_calls {max_calls!r}: pybond expected a positive "
+                "integer or None."
+            )
+        self.max_calls = max_calls
+        self._total = 0
+        self._records: list[FunctionCall] | deque[FunctionCall] = (
+            [] if max_calls is None else deque(maxlen=max_calls)
+        )
+        # Built on the first query, then maintained on each append
+        self._indexes: dict[str, _FieldIndex] = {}
+        self._latency = LatencyHistogram()
+
+    def __len__(self) -> int:
+        """Returns the number of retained records."""
+        self._flush()
+        return len(self._records)
+
+    @property
+    def total(self) -> int:
+        """Returns the number of calls, including discarded ones."""
+        self._flush()
+        return self._total
+
+    @property
+    def latency(self) -> LatencyHistogram:
+        """Returns a histogram of the durations of recorded calls."""
+        self._flush()
+        return self._latency
+
+    def _flush(self) -> None:
+        """Makes pending records visible to readers."""
+        return
+
+    def _store(self, record: FunctionCall) -> None:
+        if self._indexes:
+            if len(self._records) == self.max_calls:
+                for index in self._indexes.values():
+                    index.remove(self._records[0])
+            for index in self._indexes.values():
+                index.add(record)
+        self._records.append(record)
+
+    def _unstore(self) -> FunctionCall:
+        record = self._records.pop()
+        for index in self._indexes.values():
+            index.remove(record)
+        return record
+
+    def append(self, record: FunctionCall) -> None:
+        self._store(record)
+        self._total += 1
+        if record.duration_ns is not None:
+            self._latency.add(record.duration_ns)
+
+    def skip(self) -> None:
+        """Counts a call which is not recorded."""
+        self._total += 1
+
+    def complete(self, record: FunctionCall) -> None:
+        """
+        Called when the generator returned by a recorded call is finished,
+        failed or closed, at which point `record` no longer changes.
+        """
+        return
+
+    def count(self, field: str, value: Any) -> int:
+        """
+        Returns the number of retained records whose `field` (`args` or
+        `kwargs`) equals `value`. Hashable values are looked up in an index.
+        """
+        self._flush()
+        if field not in self._indexes:
+            self._indexes[field] = _FieldIndex(field, self._records)
+        return self._indexes[field].count(value, self._records)
+
+    def records(self) -> list[FunctionCall]:
+        """Returns the retained records, oldest first."""
+        self._flush()
+        if isinstance(self._records, list):
+            return self._records
+        return list(self._records)
+
+    def clear(self) -> None:
+        self._flush()
+        self._total = 0
+        self._records.clear()
+        self._indexes.clear()
+        self._latency = LatencyHistogram()
+
+    def close(self) -> None:
+        """Called when the spy is removed."""
+        return
+
+
+class _ThreadBuffer:
+    __slots__ = ("records", "appended", "flushed", "latency")
+
+    def __init__(self, max_calls: int | None):
+        self.records: deque[FunctionCall] = deque(maxlen=max_calls)
+        self.appended = 0
+        self.flushed = 0
+        self.latency = LatencyHistogram()
+
+
+def _seq(record: FunctionCall) -> int:
+    return record.seq
+
+
+class ThreadedCallLog(CallLog):
+    """
+    A call log for functions called from several threads. Each thread appends
+    to its own buffer without taking a lock, and records carry a global
+    sequence number. Buffers are merged in sequence order when the log is read.
+    """
+
+    def __init__(self, max_calls: int | None = None):
+        super().__init__(max_calls)
+        self._sequence = count()
+        self._local = local()
+        self._buffers: list[_ThreadBuffer] = []
+        self._lock = Lock()
+
+    def _buffer(self) -> _ThreadBuffer:
+        try:
+            return self._local.buffer
+        except AttributeError:
+            buffer = _ThreadBuffer(self.max_calls)
+            with self._lock:
+                self._buffers.append(buffer)
+            self._local.buffer = buffer
+            return buffer
+
+    def append(self, record: FunctionCall) -> None:
+        buffer = self._buffer()
+        record.seq = next(self._sequence)
+        buffer.records.append(record)
+        buffer.appended += 1
+        if record.duration_ns is not None:
+            buffer.latency.add(record.duration_ns)
+
+    def skip(self) -> None:
+        self._buffer().appended += 1
+
+    def _flush(self) -> None:
+        with self._lock:
+            pending = []
+            for buffer in self._buffers:
+                records = buffer.records
+                pending.append([records.popleft() for _ in range(len(records))])
+                appended = buffer.appended
+                self._total += appended - buffer.flushed
+                buffer.flushed = appended
+            merged = list(merge(*pending, key=_seq))
+            if not merged:
+                return
+            # Records appended by a thread after a previous flush may predate
+            # records which were already merged.
+            late = []
+            while self._records and self._records[-1].seq > merged[0].seq:
+                late.append(self._unstore())
+            late.reverse()
+            for record in merge(late, merged, key=_seq):
+                self._store(record)
+
+    def clear(self) -> None:
+        with self._lock:
+            for buffer in self._buffers:
+                # Threads append their record before counting it, so reading
+                # the count first means that every record which is kept is
+                # counted later on.
+                appended = buffer.appended
+                for _ in range(len(buffer.records)):
+                    buffer.records.popleft()
+                buffer.flushed = appended
+                buffer.latency = LatencyHistogram()
+            self._total = 0
+            self._records.clear()
+            self._indexes.clear()
+            self._latency = LatencyHistogram()
+
+    @property
+    def latency(self) -> LatencyHistogram:
+        with self._lock:
+            buffers = list(self._buffers)
+        latency = LatencyHistogram()
+        for buffer in buffers:
+            latency = latency.merge(buffer.latency)
+        return latency
+
+
+class SinkCallLog(CallLog):
+    """
+    A call log which streams every record to a sink instead of retaining it.
+    Records are read back lazily from the sink.
+
+    Calls which returned a generator are only written once the generator is
+    finished, failed or closed (or when the log is closed), so that their
+    yielded items and return value are known.
+    """
+
+    def __init__(self, sink: CallSink):
+        super().__init__()
+        self.sink = sink
+        self._lock = Lock()
+        self._generator_records: dict[int, FunctionCall] = {}
+
+    def __len__(self) -> int:
+        return self.total
+
+    def append(self, record: FunctionCall) -> None:
+        with self._lock:
+            record.seq = self._total
+            self._total += 1
+            if record.duration_ns is not None:
+                self._latency.add(record.duration_ns)
+            if record.yields is not None:
+                self._generator_records[id(record)] = record
+                return
+        self.sink.write(record)
+
+    def complete(self, record: FunctionCall) -> None:
+        with self._lock:
+            pending = self._generator_records.pop(id(record), None)
+        if pending is not None:
+            self.sink.write(pending)
+
+    def skip(self) -> None:
+        with self._lock:
+            self._total += 1
+
+    def count(self, field: str, value: Any) -> int:
+        # Records are compared as they were written, e.g. with tuples read
+        # back as lists from JSON
+        value = self.sink.roundtrip(value)
+        return sum(1 for record in self.sink.read() if record[field] == value)
+
+    def records(self) -> Iterator[FunctionCall]:  # type: ignore[override]
+        """Returns a lazy iterator over the records, oldest first."""
+        return self.sink.read()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._total = 0
+            self._latency = LatencyHistogram()
+            self._generator_records.clear()
+            self.sink.clear()
+
+    def close(self) -> None:
+        # Generators which were never consumed are written as they are
+        with self._lock:
+            pending = list(self._generator_records.values())
+            self._generator_records.clear()
+        for record in sorted(pending, key=_seq):
+            self.sink.write(record)
+        self.sink.close()
+
+
+class CountingCallLog(CallLog):
+    """
+    A call log which only counts calls and errors, and retains nothing else.
+    """
+
+    def __init__(self, threadsafe: bool = False):
+        super().__init__()
+        self.errors = 0
+        self._lock = Lock() if threadsafe else None
+
+    def _not_recorded_error(self) -> ValueError:
+        return ValueError(
+            "The calls of this spied function were counted but not recorded "
+            "(record=\"count\"): its arguments and return values are not "
+            "known."
+        )
+
+    def append(self, record: FunctionCall) -> None:
+        raise self._not_recorded_error()
+
+    def skip(self) -> None:
+        if self._lock is None:
+            self._total += 1
+        else:
+            with self._lock:
+                self._total += 1
+
+    def fail(self) -> None:
+        """Counts a call which raised an error."""
+        if self._lock is None:
+            self.errors += 1
+        else:
+            with self._lock:
+                self.errors += 1
+
+    def count(self, field: str, value: Any) -> int:
+        raise self._not_recorded_error()
+
+    def records(self) -> list[FunctionCall]:
+        raise self._not_recorded_error()
+
+    def clear(self) -> None:
+        super().clear()
+        self.errors = 0
+
+
+_process_call_logs: WeakSet = WeakSet()
+
+
+def _after_fork_in_child() -> None:
+    for log in list(_process_call_logs):
+        log._after_fork_in_child()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+class ProcessCallLog(CallLog):
+    """
+    A call log which also records calls made in child processes forked after
+    the spy was created, e.g. by `multiprocessing` or `ProcessPoolExecutor`
+    workers using the "fork" start method.
+
+    Children send their records to the parent through a pipe, and a thread of
+    the parent collects them. Reading the log first waits for the records
+    already sent to be collected, so calls made by workers whose results have
+    been received are always visible.
+    """
+
+    def __init__(self, max_calls: int | None = None):
+        super().__init__(max_calls)
+        # Imported here so that importing pybond stays cheap
+        from multiprocessing import SimpleQueue
+
+        self._pid = os.getpid()
+        self._queue = SimpleQueue()
+        self._lock = Lock()
+        self._collected = Condition(self._lock)
+        self._pending: list[FunctionCall | None] = []
+        # Generator records of a child, by id, until they are complete
+        self._generator_records: dict[int, FunctionCall] = {}
+        self._barriers_sent = 0
+        self._barriers_seen = 0
+        self._collector: Thread | None = None
+        self._start_collecting()
+        _process_call_logs.add(self)
+
+    def _after_fork_in_child(self) -> None:
+        # Locks may have been held by another thread of the parent, and
+        # threads do not survive a fork.
+        self._lock = Lock()
+        self._collected = Condition(self._lock)
+        self._pending = []
+        self._generator_records = {}
+        self._collector = None
+
+    def _in_child(self) -> bool:
+        return os.getpid() != self._pid
+
+    def _start_collecting(self) -> None:
+        if self._collector is None or not self._collector.is_alive():
+            self._collector = Thread(
+                target=self._collect,
+                name="pybond-process-call-log",
+                daemon=True,
+            )
+            self._collector.start()
+
+    def _collect(self) -> None:
+        while (message := self._queue.get()) is not None:
+            kind, payload = message
+            with self._lock:
+                if kind == "call":
+                    *fields, start_ns, duration_ns, yields = pickle.loads(
+                        payload
+                    )
+                    if start_ns is None:
+                        record = FunctionCall(*fields)
+                    else:
+                        record = TimedFunctionCall(
+                            *fields, start_ns, duration_ns
+                        )
+                    record.yields = yields
+                    self._pending.append(record)
+                elif kind == "skip":
+                    self._pending.append(None)
+                else:
+                    self._barriers_seen = payload
+                    self._collected.notify_all()
+
+    def _send(self, record: FunctionCall) -> None:
+        fields = (
+            record.args,
+            record.kwargs,
+            portable_error(record.error),
+            record.return_value,
+            record.start_ns,
+            record.duration_ns,
+            record.yields,
+        )
+        self._queue.put(("call", dumps_portable(fields)))
+
+    def append(self, record: FunctionCall) -> None:
+        if self._in_child():
+            if record.yields is not None:
+                # Sent once the generator is finished, failed or closed
+                self._generator_records[id(record)] = record
+            else:
+                self._send(record)
+            return
+        with self._lock:
+            super().append(record)
+
+    def complete(self, record: FunctionCall) -> None:
+        if self._in_child():
+            pending = self._generator_records.pop(id(record), None)
+            if pending is not None:
+                self._send(pending)
+
+    def skip(self) -> None:
+        if self._in_child():
+            self._queue.put(("skip", None))
+            return
+        with self._lock:
+            self._total += 1
+
+    def _flush(self) -> None:
+        if self._in_child():
+            return
+        with self._lock:
+            if self._collector is not None and self._collector.is_alive():
+                self._barriers_sent += 1
+                barrier = self._barriers_sent
+                self._queue.put(("barrier", barrier))
+                self._collected.wait_for(
+                    lambda: self._barriers_seen >= barrier
+                )
+            pending, self._pending = self._pending, []
+            for record in pending:
+                if record is None:
+                    self._total += 1
+                else:
+                    super().append(record)
+
+    def clear(self) -> None:
+        super().clear()
+        if not self._in_child():
+            self._start_collecting()
+
+    def close(self) -> None:
+        if self._in_child() or self._collector is None:
+            return
+        self._flush()
+        self._queue.put(None)
+        self._collector.join()
+        self._collector = None
+
+
+@lru_cache(maxsize=None)
+def _numpy() -> Any:
+    """
+    Returns the NumPy module, or None if it is not installed. It is imported
+    on first use so that importing pybond stays cheap.
+    """
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover
+        return None
+    return numpy
+
+
+# Exact types stored in typed arrays. Other values (including bools) are kept
+# in an object column so that they are read back unchanged.
+_TYPECODES = {int: "q", float: "d"}
+
+
+class _Column:
+    """
+    A growable column of values, one per recorded call. Columns of ints or
+    floats are stored in typed arrays, and switch to a list of objects as soon
+    as a value of another type (or a missing value) is appended.
+    """
+
+    __slots__ = ("values",)
+
+    def __init__(self, row: int, value: Any):
+        typecode = _TYPECODES.get(type(value))
+        if row == 0 and typecode is not None:
+            self.values: array | list = array(typecode)
+        else:
+            self.values = [None] * row
+        self.append(row, value)
+
+    def _to_list(self) -> list:
+        if isinstance(self.values, array):
+            self.values = self.values.tolist()
+        return self.values
+
+    def append(self, row: int, value: Any) -> None:
+        values = self.values
+        if len(values) < row:
+            values = self._to_list()
+            values.extend([None] * (row - len(values)))
+        if isinstance(values, array):
+            if _TYPECODES.get(type(value)) == values.typecode:
+                try:
+                    values.append(value)
+                    return
+                except OverflowError:
+                    pass
+            values = self._to_list()
+        values.append(value)
+
+    def get(self, row: int) -> Any:
+        return self.values[row] if row < len(self.values) else None
+
+    def padded(self, rows: int) -> array | list:
+        if len(self.values) < rows:
+            self._to_list().extend([None] * (rows - len(self.values)))
+        return self.values
+
+
+# Bound below which the float64 sum of an int64 column proves that the exact
+# sum fits in an int64, with a wide margin for rounding errors
+_INT64_SAFE_SUM = 2.0**62
+
+
+class Column:
+    """
+    A read-only view over one column of a columnar call log: a positional
+    argument, a keyword argument or the return value of every recorded call.
+    Calls in which the value is missing hold None.
+
+    Aggregates over numeric columns are computed with NumPy when it is
+    installed, and over the underlying typed array otherwise.
+    """
+
+    def __init__(self, values: array | list):
+        self._values = values
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def is_numeric(self) -> bool:
+        return isinstance(self._values, array)
+
+    def _ndarray(self) -> Any:
+        """
+        Returns a NumPy array sharing the column's memory, or None if the
+        column is not numeric or NumPy is not installed.
+        """
+        numpy = _numpy() if self.is_numeric else None
+        if numpy is None:
+            return None
+        return numpy.frombuffer(self._values, self._values.typecode)
+
+    @property
+    def values(self) -> Any:
+        """
+        Returns the values as a NumPy array sharing the column's memory when
+        the column is numeric and NumPy is installed, or as a list otherwise.
+        """
+        ndarray = self._ndarray()
+        if ndarray is not None:
+            return ndarray
+        elif self.is_numeric:
+            return self._values.tolist()
+        return list(self._values)
+
+    def sum(self) -> int | float:
+        ndarray = self._ndarray()
+        if ndarray is None:
+            return sum(self._values)
+        elif self._values.typecode != "q":
+            return ndarray.sum().item()
+        # NumPy sums ints modulo 2**64, which is exact as long as the total
+        # fits in an int64: the float total tells whether it does.
+        if abs(ndarray.sum(dtype="float64").item()) < _INT64_SAFE_SUM:
+            return ndarray.sum().item()
+        return sum(self._values)
+
+    def min(self) -> Any:
+        if not self._values:
+            return None
+        ndarray = self._ndarray()
+        if ndarray is not None:
+            return ndarray.min().item()
+        return min(self._values)
+
+    def max(self) -> Any:
+        if not self._values:
+            return None
+        ndarray = self._ndarray()
+        if ndarray is not None:
+            return ndarray.max().item()
+        return max(self._values)
+
+    def mean(self) -> float | None:
+        return self.sum() / len(self._values) if self._values else None
+
+    def within(self, low: Any = None, high: Any = None) -> bool:
+        """
+        Returns whether every value is in the inclusive range [low, high]. An
+        empty column is always within range.
+        """
+        if not self._values:
+            return True
+        return (low is None or self.min() >= low) and (
+            high is None or self.max() <= high
+        )
+
+    def distinct(self) -> int:
+        """Returns the number of distinct values."""
+        ndarray = self._ndarray()
+        if ndarray is not None:
+            return len(_numpy().unique(ndarray))
+        try:
+            return len(set(self._values))
+        except TypeError:
+            distinct: list[Any] = []
+            for value in self._values:
+                if value not in distinct:
+                    distinct.append(value)
+            return len(distinct)
+
+
+class ColumnarCallLog(CallLog):
+    """
+    A call log which stores each positional argument, keyword argument and
+    the return value of the recorded calls in its own column, rather than one
+    record per call. Numeric columns are stored in typed arrays. Records are
+    rebuilt when the calls are read; the durations of timed calls are only
+    kept in the latency histogram.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._reset_columns()
+
+    def _reset_columns(self) -> None:
+        self._rows = 0
+        self._args: list[_Column] = []
+        self._kwargs: dict[str, _Column] = {}
+        self._returns: _Column | None = None
+        # Each distinct (number of args, keyword names) is stored once
+        self._shape_ids: dict[Any, int] = {}
+        self._shapes: list[Any] = []
+        self._row_shapes = array("I")
+        # Rare values are stored by row
+        self._errors: dict[int, Any] = {}
+        self._receivers: dict[int, Any] = {}
+        self._generator_records: dict[int, FunctionCall] = {}
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def _shape_id(self, args: Any, kwargs: Any) -> int:
+        shape = (
+            None if args is None else len(args),
+            None if kwargs is None else tuple(kwargs),
+        )
+        shape_id = self._shape_ids.get(shape)
+        if shape_id is None:
+            shape_id = self._shape_ids[shape] = len(self._shapes)
+            self._shapes.append(shape)
+        return shape_id
+
+    def append(self, record: FunctionCall) -> None:
+        row = self._rows
+        args, kwargs = record.args, record.kwargs
+        for i, value in enumerate(args or ()):
+            if i < len(self._args):
+                self._args[i].append(row, value)
+            else:
+                self._args.append(_Column(row, value))
+        for name, value in (kwargs or {}).items():
+            column = self._kwargs.get(name)
+            if column is None:
+                self._kwargs[name] = _Column(row, value)
+            else:
+                column.append(row, value)
+        if self._returns is None:
+            self._returns = _Column(row, record.return_value)
+        else:
+            self._returns.append(row, record.return_value)
+        self._row_shapes.append(self._shape_id(args, kwargs))
+        if record.error is not None:
+            self._errors[row] = record.error
+        if record.receiver is not None:
+            self._receivers[row] = record.receiver
+        if record.yields is not None:
+            # Generator records are completed as the generator is consumed
+            self._generator_records[row] = record
+        self._rows += 1
+        self._total += 1
+        if record.duration_ns is not None:
+            self._latency.add(record.duration_ns)
+
+    def _record(self, row: int) -> FunctionCall:
+        if row in self._generator_records:
+            return self._generator_records[row]
+        n_args, names = self._shapes[self._row_shapes[row]]
+        args = kwargs = None
+        if n_args is not None:
+            args = [self._args[i].get(row) for i in range(n_args)]
+        if names is not None:
+            kwargs = {name: self._kwargs[name].get(row) for name in names}
+        return FunctionCall(
+            args,
+            kwargs,
+            self._errors.get(row),
+            self._returns.get(row) if self._returns is not None else None,
+            receiver=self._receivers.get(row),
+        )
+
+    def records(self) -> list[FunctionCall]:
+        """Rebuilds the records, oldest first."""
+        return [self._record(row) for row in range(self._rows)]
+
+    def count(self, field: str, value: Any) -> int:
+        return sum(1 for record in self.records() if record[field] == value)
+
+    def column(self, key: int | str) -> Column:
+        """
+        Returns a view over a column: the positional argument at index `key`
+        when it is an int, the keyword argument named `key`, or the return
+        values when `key` is `"return"`.
+        """
+        if isinstance(key, int):
+            column = self._args[key] if key < len(self._args) else None
+        elif key == "return":
+            column = self._returns
+        elif isinstance(key, str):
+            column = self._kwargs.get(key)
+        else:
+            raise ValueError(
+                f"Invalid column {key!r}: pybond expected the index of a "
+                "positional argument, the name of a keyword argument or "
+                "\"return\"."
+            )
+        if column is None:
+            return Column([None] * self._rows)
+        return Column(column.padded(self._rows))
+
+    def clear(self) -> None:
+        super().clear()
+        self._reset_columns()
+
+
+def new_call_log(
+    max_calls: int | None = None,
+    threadsafe: bool = False,
+    sink: CallSink | str | PathLike | None = None,
+    record: RecordMode = "full",
+    processes: bool = False,
+) -> CallLog:
+    if processes:
+        if sink is not None or record != "full":
+            raise ValueError(
+                "sink and record modes other than \"full\" cannot be combined "
+                "with processes=True: pybond expected calls recorded in "
+                "memory."
+            )
+        return ProcessCallLog(max_calls)
+    if record == "count":
+        if max_calls is not None or sink is not None:
+            raise ValueError(
+                "max_calls and sink cannot be combined with record=\"count\": "
+                "pybond does not retain any call."
+            )
+        return CountingCallLog(threadsafe)
+    elif record == "columnar":
+        if max_calls is not None or sink is not None or threadsafe:
+            raise ValueError(
+                "max_calls, sink and threadsafe cannot be combined with "
+                "record=\"columnar\": pybond expected a single-threaded spy "
+                "retaining every call."
+            )
+        return ColumnarCallLog()
+    elif record != "full":
+        raise ValueError(
+            f"Unsupported record mode {record!r}: pybond expected \"full\", "
+            "\"count\" or \"columnar\"."
+        )
+    elif sink is not None:
+        if max_calls is not None:
+            raise ValueError(
+                "max_calls cannot be combined with a sink: pybond streams "
+                "every call to the sink."
+            )
+        return SinkCallLog(as_sink(sink))
+    elif threadsafe:
+        return ThreadedCallLog(max_calls)
+    return CallLog(max_calls)
@@ -0,0 +1,83 @@
+from copy import copy, deepcopy
+from typing import Any, Callable
+
+from pybond.types import CapturePolicy
+
+ArgsCapture = Callable[[tuple, dict], tuple[list | None, dict | None]]
+
+
+def maybe_deepcopy(obj: Any) -> Any:
+    try:
+        return deepcopy(obj)
+    except Exception:
+        return obj
+
+
+def maybe_copy(obj: Any) -> Any:
+    try:
+        return copy(obj)
+    except Exception:
+        return obj
+
+
+def _capture_nothing(args: tuple, kwargs: dict):
+    return None, None
+
+
+def _capture_references(args: tuple, kwargs: dict):
+    return (list(args) if args else None, dict(kwargs) if kwargs else None)
+
+
+def _capture_shallow_copies(args: tuple, kwargs: dict):
+    return (
+        [maybe_copy(arg) for arg in args] if args else None,
+        {k: maybe_copy(v) for k, v in kwargs.items()} if kwargs else None,
+    )
+
+
+def _capture_deep_copies(args: tuple, kwargs: dict):
+    # Assume the worst: f might mutate its arguments
+    return (
+        maybe_deepcopy(list(args)) if args else None,
+        maybe_deepcopy(dict(kwargs)) if kwargs else None,
+    )
+
+
+def _capture_snapshots(snapshot: Callable[[Any], Any]) -> ArgsCapture:
+    def capture(args: tuple, kwargs: dict):
+        return (
+            snapshot(list(args)) if args else None,
+            snapshot(dict(kwargs)) if kwargs else None,
+        )
+
+    return capture
+
+
+_capture_policies: dict[str, ArgsCapture] = {
+    "none": _capture_nothing,
+    "reference": _capture_references,
+    "shallow": _capture_shallow_copies,
+    "deep": _capture_deep_copies,
+}
+
+
+def args_capture(policy: CapturePolicy) -> ArgsCapture:
+    """
+    Resolves a capture policy to a function taking the positional and keyword
+    arguments of a call and returning the `args` and `kwargs` to record.
+
+    Supported policies are `"none"` (skip capture), `"reference"` (keep
+    references to the arguments), `"shallow"` (shallow copy each argument),
+    `"deep"` (deep copy the arguments, the default) or a user-supplied snapshot
+    function, which is called with the list of positional arguments and the
+    dict of keyword arguments.
+    """
+    if callable(policy):
+        return _capture_snapshots(policy)
+    elif policy in _capture_policies:
+        return _capture_policies[policy]
+    else:
+        raise ValueError(
+            f"Unsupported capture policy {policy!r}: pybond expected one of "
+            f"{', '.join(map(repr, _capture_policies))} or a Callable."
+        )
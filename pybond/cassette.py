@@ -0,0 +1,307 @@
+"""
+Record-and-replay cassettes: the calls of an expensive dependency are
+recorded once to a file, and replayed from it in later runs instead of
+calling the dependency.
+
+A cassette holds the pickled result of each distinct call, followed by an
+open-addressing hash table keyed by a digest of the target and its pickled
+arguments. The file is memory-mapped when replaying, so a cassette loads
+instantly regardless of its size, and each lookup reads a few slots of the
+table and a single result.
+
+Example usage:
+
+```
+from pybond.cassette import Cassette
+
+cassette = Cassette("tests/cassettes/pricing.cassette")
+
+if not cassette.exists():
+    with cassette.record(pricing.quote):
+        run_pricing_scenario()
+
+with cassette.replay(pricing.quote):
+    run_pricing_scenario()  # pricing.quote is not executed
+```
+
+Arguments must pickle deterministically for calls to be found again: for
+example, sets of strings do not, as their order depends on hash
+randomization. Calls whose arguments cannot be pickled are not recorded.
+"""
+
+import mmap
+import os
+import pickle
+import struct
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+from hashlib import blake2b
+from inspect import Signature, iscoroutinefunction, signature
+from os import PathLike, fspath
+from typing import Any, Callable, Iterable
+
+from pybond.james import StubPlan, calls
+from pybond.sinks import dumps_portable, portable_error
+from pybond.types import FunctionCall, Spyable
+
+_MAGIC = b"PYBONDC1"
+# Magic, number of slots (a power of two), offset of the slot table
+_HEADER = struct.Struct("<8sQQ")
+_DIGEST_SIZE = 16
+# Digest of the call, offset and size of its pickled result. Results are
+# stored after the header, so an offset of 0 marks an empty slot.
+_SLOT = struct.Struct(f"<{_DIGEST_SIZE}sQI")
+_MISSING = object()
+
+
+def _target_key(target: Spyable) -> str:
+    return f"{target.__module__}.{target.__qualname__}"
+
+
+@lru_cache(maxsize=256)
+def _signature(target: Spyable) -> Signature:
+    return signature(target)
+
+
+def _normalized_arguments(target: Spyable, args: Any, kwargs: Any) -> tuple:
+    """
+    Binds the arguments of a call to the target's signature, so that calls
+    passing the same arguments positionally or by keyword, in any order, are
+    normalized to the same arguments.
+    """
+    args, kwargs = list(args or ()), dict(kwargs or {})
+    try:
+        bound = _signature(target).bind(*args, **kwargs)
+    except (TypeError, ValueError):
+        return args, sorted(kwargs.items())
+    bound.apply_defaults()
+    return list(bound.args), sorted(bound.kwargs.items())
+
+
+def _call_digest(target: Spyable, args: Any, kwargs: Any) -> bytes | None:
+    """
+    Returns a digest of a call, or None if its arguments cannot be pickled.
+    """
+    try:
+        data = pickle.dumps(
+            (_target_key(target), *_normalized_arguments(target, args, kwargs)),
+            pickle.HIGHEST_PROTOCOL,
+        )
+    except Exception:
+        return None
+    return blake2b(data, digest_size=_DIGEST_SIZE).digest()
+
+
+def _slot_index(digest: bytes, n_slots: int) -> int:
+    return int.from_bytes(digest[:8], "little") & (n_slots - 1)
+
+
+def write_cassette(path: str | PathLike, results: dict[bytes, bytes]) -> None:
+    """
+    Writes a cassette mapping call digests to pickled results. The file is
+    replaced atomically.
+    """
+    n_slots = 8
+    while n_slots < 2 * len(results):
+        n_slots *= 2
+    slots = [None] * n_slots
+    offset = _HEADER.size
+    for digest, payload in results.items():
+        index = _slot_index(digest, n_slots)
+        while slots[index] is not None:
+            index = (index + 1) & (n_slots - 1)
+        slots[index] = (digest, offset, len(payload))
+        offset += len(payload)
+    table_offset = offset
+
+    path = fspath(path)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, n_slots, table_offset))
+        for payload in results.values():
+            file.write(payload)
+        empty = _SLOT.pack(bytes(_DIGEST_SIZE), 0, 0)
+        for slot in slots:
+            file.write(empty if slot is None else _SLOT.pack(*slot))
+    os.replace(tmp_path, path)
+
+
+def _replay_result(payload: tuple) -> Any:
+    return_value, error, yields = payload
+    if error is not None:
+        exc_type, exc_value, _ = error
+        if isinstance(exc_value, BaseException):
+            raise exc_value
+        raise RuntimeError(f"{exc_type}: {exc_value}")
+    if yields is not None:
+        return _replay_generator(yields, return_value)
+    return return_value
+
+
+def _replay_generator(yields: list, return_value: Any):
+    yield from yields
+    return return_value
+
+
+class Cassette:
+    """A cassette file, recorded with `record` and replayed with `replay`."""
+
+    def __init__(self, path: str | PathLike):
+        self.path = fspath(path)
+        self._file = None
+        self._map: mmap.mmap | None = None
+        self._n_slots = 0
+        self._table_offset = 0
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    @contextmanager
+    def record(self, *targets: Spyable, **spy_options):
+        """
+        Context manager which spies on the given targets, then writes their
+        calls to the cassette when the block exits without an error. Accepts
+        the same options as `spy`. When a call was made several times with
+        the same arguments, the first result is kept.
+        """
+        plan = StubPlan.of_spies(*targets, **spy_options)
+        with plan.apply():
+            yield
+            results = self._results(plan.replacements)
+        self.close()
+        write_cassette(self.path, results)
+
+    def _results(self, replacements: Iterable[tuple[Any, Any]]) -> dict:
+        results: dict[bytes, bytes] = {}
+        for target, spied in replacements:
+            fcall: FunctionCall
+            for fcall in calls(spied):
+                digest = _call_digest(target, fcall.args, fcall.kwargs)
+                if digest is None or digest in results:
+                    continue
+                results[digest] = dumps_portable(
+                    (
+                        fcall.return_value,
+                        portable_error(fcall.error),
+                        fcall.yields,
+                    )
+                )
+        return results
+
+    def open(self) -> None:
+        """Memory-maps the cassette. Called on the first lookup."""
+        if self._map is not None:
+            return
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(
+                self._file.fileno(),
+                0,
+                access=mmap.ACCESS_READ,
+            )
+            magic, self._n_slots, self._table_offset = _HEADER.unpack_from(
+                self._map
+            )
+        except Exception:
+            self.close()
+            raise
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(
+                f"Invalid cassette {self.path!r}: pybond expected a file "
+                "written by `Cassette.record`."
+            )
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _slot(self, index: int) -> tuple[bytes, int, int]:
+        return _SLOT.unpack_from(
+            self._map,
+            self._table_offset + index * _SLOT.size,
+        )
+
+    def __len__(self) -> int:
+        """Returns the number of recorded calls."""
+        self.open()
+        return sum(1 for i in range(self._n_slots) if self._slot(i)[1])
+
+    def lookup(self, target: Spyable, args: Any, kwargs: Any) -> Any:
+        """
+        Returns the recorded `(return value, error, yields)` of a call, or
+        `_MISSING` if the call was not recorded.
+        """
+        self.open()
+        digest = _call_digest(target, args, kwargs)
+        if digest is None:
+            return _MISSING
+        index = _slot_index(digest, self._n_slots)
+        while True:
+            slot_digest, offset, size = self._slot(index)
+            if offset == 0:
+                return _MISSING
+            elif slot_digest == digest:
+                return pickle.loads(self._map[offset : offset + size])
+            index = (index + 1) & (self._n_slots - 1)
+
+    def _replayer(self, target: Callable, passthrough: bool) -> Callable:
+        def find(args: tuple, kwargs: dict) -> Any:
+            payload = self.lookup(target, args, kwargs)
+            if payload is _MISSING and not passthrough:
+                raise ValueError(
+                    f"Call to {_target_key(target)} with args {list(args)!r} "
+                    f"and kwargs {kwargs!r} is not in cassette "
+                    f"{self.path!r}: pybond expected a recorded call."
+                )
+            return payload
+
+        if iscoroutinefunction(target):
+            @wraps(target)
+            async def replay_async(*args, **kwargs):
+                payload = find(args, kwargs)
+                if payload is _MISSING:
+                    return await target(*args, **kwargs)
+                return _replay_result(payload)
+
+            return replay_async
+
+        @wraps(target)
+        def replay(*args, **kwargs):
+            payload = find(args, kwargs)
+            if payload is _MISSING:
+                return target(*args, **kwargs)
+            return _replay_result(payload)
+
+        return replay
+
+    @contextmanager
+    def replay(
+        self,
+        *targets: Spyable,
+        passthrough: bool = False,
+        **stub_options,
+    ):
+        """
+        Context manager which stubs the given targets with the results
+        recorded in the cassette. Calls which were not recorded raise a
+        ValueError, or call the real target when `passthrough` is true.
+        Accepts the same options as `stub`, so replayed calls are spied on.
+        """
+        self.open()
+        plan = StubPlan(
+            *[
+                (target, self._replayer(target, passthrough))
+                for target in targets
+            ],
+            **stub_options,
+        )
+        try:
+            with plan.apply():
+                yield
+        finally:
+            self.close()
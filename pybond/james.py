@@ -2,91 +2,395 @@
 
 import sys
 from contextlib import contextmanager
-from copy import deepcopy
 from functools import wraps
-from inspect import isclass
-from typing import Any, Callable
+from inspect import isclass, iscoroutinefunction, isfunction, ismethod
+from os import PathLike
+from time import perf_counter_ns
+from types import GeneratorType
+from typing import Any, Callable, Generator, Iterable
+
+from pybond.call_log import (
+    CallLog,
+    Column,
+    ColumnarCallLog,
+    CountingCallLog,
+    new_call_log,
+)
+from pybond.capture import args_capture
+from pybond.memory import (
+    binding_index,
+    deep_rebind,
+    rebind,
+    resolve_bindings,
+)
+from pybond.patch import PatchJournal
+from pybond.sampling import Sampler, sampler
+from pybond.sinks import CallSink
+from pybond.stats import LatencyHistogram
+from pybond.util import function_signatures_match, is_wrapped_function
+from pybond.types import (
+    CapturePolicy,
+    FunctionCall,
+    RecordMode,
+    Spyable,
+    SpyTarget,
+    StubTarget,
+    TimedFunctionCall,
+)
+
+
+def _function_call(
+    args,
+    kwargs,
+    error,
+    return_value,
+    start_ns=None,
+    duration_ns=None,
+    receiver=None,
+) -> FunctionCall:
+    if start_ns is None:
+        return FunctionCall(args, kwargs, error, return_value, receiver)
+    return TimedFunctionCall(
+        args,
+        kwargs,
+        error,
+        return_value,
+        start_ns,
+        duration_ns,
+        receiver,
+    )
 
-from pytest import MonkeyPatch
 
-from pybond.memory import replace_bound_references_in_memory
-from pybond.util import function_signatures_match, is_wrapped_function
-from pybond.types import FunctionCall, Spyable, SpyTarget, StubTarget
+def _spy_generator(
+    generator: Generator,
+    _calls: CallLog,
+    args: list | None,
+    kwargs: dict | None,
+    start_ns: int | None,
+    duration_ns: int | None,
+    receiver: Any,
+) -> Generator:
+    """
+    Records a call which returned a generator, then returns a generator which
+    delegates to it. Yielded items, the return value and errors are recorded
+    as the consumer pulls values, without buffering the generator. The call
+    log is notified once the generator is finished, failed or closed.
+    """
+    record = _function_call(
+        args,
+        kwargs,
+        error=None,
+        return_value=None,
+        start_ns=start_ns,
+        duration_ns=duration_ns,
+        receiver=receiver,
+    )
+    record.yields = []
+    _calls.append(record)
+
+    def spied_generator():
+        try:
+            item = next(generator)
+            while True:
+                record.yields.append(item)
+                try:
+                    sent = yield item
+                except GeneratorExit:
+                    generator.close()
+                    raise
+                except BaseException as e:
+                    item = generator.throw(e)
+                else:
+                    item = generator.send(sent)
+        except StopIteration as stop:
+            record.return_value = stop.value
+            return stop.value
+        except Exception:
+            record.error = sys.exc_info()
+            raise
+        finally:
+            _calls.complete(record)
 
+    return spied_generator()
 
-def _function_call(args, kwargs, error, return_value) -> FunctionCall:
-    return {
-        "args": args,
-        "kwargs": kwargs,
-        "error": error,
-        "return": return_value,
-    }
 
+def _sampling_wrapper(
+    f: Callable,
+    record_call: Callable,
+    sampled: Sampler,
+    _calls: CallLog,
+) -> Callable:
+    """
+    Wrap f so that only sampled calls go through `record_call`. Other calls
+    are only counted.
+    """
+    if iscoroutinefunction(f):
+        @wraps(f)
+        async def handle_function_call(*args, **kwargs):
+            if sampled():
+                return await record_call(*args, **kwargs)
+            _calls.skip()
+            return await f(*args, **kwargs)
+    else:
+        @wraps(f)
+        def handle_function_call(*args, **kwargs):
+            if sampled():
+                return record_call(*args, **kwargs)
+            _calls.skip()
+            return f(*args, **kwargs)
+
+    return handle_function_call
+
+
+def _counting_wrapper(f: Callable, _calls: CountingCallLog) -> Callable:
+    """
+    Wrap f so that its calls and errors are counted, and nothing is recorded.
+    """
+    if iscoroutinefunction(f):
+        @wraps(f)
+        async def handle_function_call(*args, **kwargs):
+            _calls.skip()
+            try:
+                return await f(*args, **kwargs)
+            except Exception:
+                _calls.fail()
+                raise
+    else:
+        @wraps(f)
+        def handle_function_call(*args, **kwargs):
+            _calls.skip()
+            try:
+                return f(*args, **kwargs)
+            except Exception:
+                _calls.fail()
+                raise
 
-def maybe_deepcopy(obj: Any) -> Any:
-    try:
-        return deepcopy(obj)
-    except Exception:
-        return obj
+    return handle_function_call
 
 
-def _spy_function(f: Callable) -> Spyable:
+def _spy_function(
+    f: Callable,
+    capture: CapturePolicy = "deep",
+    max_calls: int | None = None,
+    threadsafe: bool = False,
+    sink: CallSink | str | PathLike | None = None,
+    sample: float | None = None,
+    sample_every: int | None = None,
+    record: RecordMode = "full",
+    processes: bool = False,
+    timing: bool = False,
+    bound: bool = False,
+) -> Spyable:
     """
     Wrap f, returning a new function that keeps track of its call count and
-    arguments.
+    arguments. Arguments are recorded according to the `capture` policy, and
+    only the last `max_calls` calls are retained if it is given. Coroutine
+    functions are wrapped in a coroutine function which records the awaited
+    result, and generators are wrapped so that their items are recorded as
+    they are yielded. When sampling, only sampled calls are recorded, but
+    every call is counted. With `record="count"`, calls and errors are only
+    counted. With `timing`, the start and duration of each recorded call are
+    measured as well.
+
+    When f is a method (`bound` is true), records keep a reference to the
+    instance or class the method was called on as their receiver, and it is
+    left out of the captured `args`.
     """
-    _calls = []
+    _calls = new_call_log(max_calls, threadsafe, sink, record, processes)
+    capture_args = args_capture(capture)
+    if bound:
+        capture_call_args = capture_args
+
+        def capture_args(args, kwargs):
+            # The receiver is kept by reference, and never copied
+            return capture_call_args(args[1:], kwargs)
+    sampled = sampler(sample, sample_every)
 
     def calls():
-        return _calls
+        return _calls.records()
 
-    @wraps(f)
-    def handle_function_call(*args, **kwargs):
-        # Assume the worst: f might mutate its arguments
-        non_mutated_args = maybe_deepcopy(list(args)) if args else None
-        non_mutated_kwargs = maybe_deepcopy(dict(kwargs)) if kwargs else None
-        try:
-            return_value = f(*args, **kwargs)
-            _calls.append(
-                _function_call(
-                    args=non_mutated_args,
-                    kwargs=non_mutated_kwargs,
-                    error=None,
-                    return_value=return_value,
-                )
+    if isinstance(_calls, CountingCallLog):
+        if sampled is not None:
+            raise ValueError(
+                "Sampling cannot be combined with record=\"count\": pybond "
+                "does not record any call."
             )
-            return return_value
-        except Exception:
-            _calls.append(
-                _function_call(
-                    args=non_mutated_args,
-                    kwargs=non_mutated_kwargs,
-                    error=sys.exc_info(),
-                    return_value=None,
+        handle_function_call = _counting_wrapper(f, _calls)
+    elif iscoroutinefunction(f):
+        # Await the call so that the awaited result (or error) is recorded
+        # rather than the coroutine object
+        @wraps(f)
+        async def handle_function_call(*args, **kwargs):
+            non_mutated_args, non_mutated_kwargs = capture_args(args, kwargs)
+            start_ns = perf_counter_ns() if timing else None
+            try:
+                return_value = await f(*args, **kwargs)
+                duration_ns = perf_counter_ns() - start_ns if timing else None
+                _calls.append(
+                    _function_call(
+                        args=non_mutated_args,
+                        kwargs=non_mutated_kwargs,
+                        error=None,
+                        return_value=return_value,
+                        start_ns=start_ns,
+                        duration_ns=duration_ns,
+                        receiver=args[0] if bound and args else None,
+                    )
                 )
-            )
-            raise
+                return return_value
+            except Exception:
+                _calls.append(
+                    _function_call(
+                        args=non_mutated_args,
+                        kwargs=non_mutated_kwargs,
+                        error=sys.exc_info(),
+                        return_value=None,
+                        start_ns=start_ns,
+                        duration_ns=(
+                            perf_counter_ns() - start_ns if timing else None
+                        ),
+                        receiver=args[0] if bound and args else None,
+                    )
+                )
+                raise
+    else:
+        @wraps(f)
+        def handle_function_call(*args, **kwargs):
+            non_mutated_args, non_mutated_kwargs = capture_args(args, kwargs)
+            start_ns = perf_counter_ns() if timing else None
+            try:
+                return_value = f(*args, **kwargs)
+                duration_ns = perf_counter_ns() - start_ns if timing else None
+                if isinstance(return_value, GeneratorType):
+                    return _spy_generator(
+                        return_value,
+                        _calls,
+                        non_mutated_args,
+                        non_mutated_kwargs,
+                        start_ns,
+                        duration_ns,
+                        args[0] if bound and args else None,
+                    )
+                _calls.append(
+                    _function_call(
+                        args=non_mutated_args,
+                        kwargs=non_mutated_kwargs,
+                        error=None,
+                        return_value=return_value,
+                        start_ns=start_ns,
+                        duration_ns=duration_ns,
+                        receiver=args[0] if bound and args else None,
+                    )
+                )
+                return return_value
+            except Exception:
+                _calls.append(
+                    _function_call(
+                        args=non_mutated_args,
+                        kwargs=non_mutated_kwargs,
+                        error=sys.exc_info(),
+                        return_value=None,
+                        start_ns=start_ns,
+                        duration_ns=(
+                            perf_counter_ns() - start_ns if timing else None
+                        ),
+                        receiver=args[0] if bound and args else None,
+                    )
+                )
+                raise
+
+    if sampled is not None:
+        handle_function_call = _sampling_wrapper(
+            f,
+            handle_function_call,
+            sampled,
+            _calls,
+        )
 
     handle_function_call.__wrapped__ = f
     setattr(handle_function_call, "calls", calls)
+    setattr(handle_function_call, "call_log", _calls)
+    setattr(handle_function_call, "timing", timing)
     return handle_function_call
 
 
+def _not_spied_error() -> ValueError:
+    return ValueError(
+        "The argument is not a spied function. Calls of an unspied "
+        "function are not tracked and are therefore not known."
+    )
+
+
+def call_log(f: Spyable) -> CallLog:
+    """
+    Takes one arg, a function that has previously been spied. Returns its call
+    log, which keeps an exact count of calls even when old records have been
+    discarded.
+
+    If the function has not been spied, raises an exception.
+    """
+    if hasattr(f, "call_log") and callable(f):
+        return getattr(f, "call_log")
+    raise _not_spied_error()
+
+
 def calls(f: Spyable) -> list[FunctionCall]:
     """
     Takes one arg, a function that has previously been spied. Returns a list of
     function call dicts, one per call. Each object contains the keys `args`,
-    `kwargs`, `error` and `return_value`.
+    `kwargs`, `error` and `return_value`. Spies which stream their calls to a
+    sink return a lazy iterator instead.
+
+    Methods of spied classes can be passed either through the class, to get
+    the calls on every instance, or bound to an instance, to only get the calls
+    on that instance.
 
     If the function has not been spied, raises an exception.
     """
     if hasattr(f, "calls") and callable(f):
+        if ismethod(f):
+            return [
+                fcall
+                for fcall in getattr(f, "calls")()
+                if fcall.receiver is f.__self__
+            ]
         return getattr(f, "calls")()
-    else:
+    raise _not_spied_error()
+
+
+def latency(f: Spyable) -> LatencyHistogram:
+    """
+    Takes one arg, a function that has previously been spied. Returns a
+    streaming histogram of the durations of its recorded calls, in
+    nanoseconds. Calls are only timed by spies created with `timing=True`.
+
+    If the function has not been spied, raises an exception.
+    """
+    log = call_log(f)
+    if not getattr(f, "timing", False):
+        raise ValueError(
+            "The calls of this spied function are not timed: pybond expected "
+            "a spy created with timing=True."
+        )
+    return log.latency
+
+
+def column(f: Spyable, key: int | str) -> Column:
+    """
+    Takes a function that has previously been spied with `record="columnar"`
+    and a column: the index of a positional argument, the name of a keyword
+    argument or `"return"`. Returns a view over the values of that column,
+    with vectorized aggregates (`sum`, `min`, `max`, `within`, `distinct`).
+
+    If the function has not been spied, raises an exception.
+    """
+    log = call_log(f)
+    if not isinstance(log, ColumnarCallLog):
         raise ValueError(
-            "The argument is not a spied function. Calls of an unspied "
-            "function are not tracked and are therefore not known."
+            "The calls of this spied function are not stored in columns: "
+            "pybond expected a spy created with record=\"columnar\"."
         )
+    return log.column(key)
 
 
 def _function_signatures_match(originalf: Callable, stubf: Callable) -> bool:
@@ -100,13 +404,96 @@ def _function_signatures_match(originalf: Callable, stubf: Callable) -> bool:
     )
 
 
+_Py_TPFLAGS_IMMUTABLETYPE = 1 << 8
+
+# Special methods which are called implicitly by the interpreter or by pybond
+# itself (e.g. when deep copying arguments) are never instrumented.
+_INSTRUMENTED_SPECIAL_METHODS = {"__init__", "__call__"}
+
+
 def _check_if_class_is_instrumentable(
     original_obj: Spyable,
     stub_obj: Spyable,
     strict: bool = True,
 ) -> None:
-    # TODO: implement spying on classes and class methods
-    return
+    if not isclass(stub_obj):
+        raise ValueError(
+            f"Provided stub for class {original_obj.__name__} of type "
+            f"{type(stub_obj)} is invalid: pybond expected a class."
+        )
+    if stub_obj.__flags__ & _Py_TPFLAGS_IMMUTABLETYPE:
+        raise ValueError(
+            f"Class {stub_obj.__name__} is immutable and its methods cannot be "
+            "spied on by pybond."
+        )
+
+
+def _spied_class_attribute(attr: Any, **spy_options) -> Any | None:
+    """
+    Returns a spied version of a method, class method, static method or
+    property, or None if `attr` is not one of those.
+    """
+    if isinstance(attr, staticmethod):
+        return staticmethod(_spy_function(attr.__func__, **spy_options))
+    elif isinstance(attr, classmethod):
+        return classmethod(
+            _spy_function(attr.__func__, bound=True, **spy_options)
+        )
+    elif isinstance(attr, property):
+        return property(
+            *[
+                None if fn is None else _spy_function(
+                    fn,
+                    bound=True,
+                    **spy_options,
+                )
+                for fn in (attr.fget, attr.fset, attr.fdel)
+            ],
+            attr.__doc__,
+        )
+    elif isfunction(attr):
+        return _spy_function(attr, bound=True, **spy_options)
+    return None
+
+
+def _spied_class_attributes(cls: type, **spy_options) -> dict[str, Any]:
+    """
+    Returns spied versions of every method, class method, static method and
+    property of `cls`, including inherited ones. Spied methods are plain
+    functions, so they are bound to instances like the original methods.
+    """
+    if spy_options.get("sink") is not None:
+        raise ValueError(
+            "A sink cannot be used when spying on a class: pybond would stream "
+            "the calls of every method to the same sink."
+        )
+    attrs = {}
+    for klass in reversed(cls.__mro__[:-1]):
+        for name, attr in vars(klass).items():
+            if (
+                name.startswith("__")
+                and name.endswith("__")
+                and name not in _INSTRUMENTED_SPECIAL_METHODS
+            ):
+                continue
+            attrs[name] = attr
+    spied_attrs = {
+        name: _spied_class_attribute(attr, **spy_options)
+        for name, attr in attrs.items()
+    }
+    return {
+        name: spied_attr
+        for name, spied_attr in spied_attrs.items()
+        if spied_attr is not None
+    }
+
+
+def _spies_of_class_attribute(attr: Any) -> list[Spyable]:
+    if isinstance(attr, (staticmethod, classmethod)):
+        return [attr.__func__]
+    elif isinstance(attr, property):
+        return [fn for fn in (attr.fget, attr.fset, attr.fdel) if fn]
+    return [attr]
 
 
 def _check_if_function_is_instrumentable(
@@ -124,14 +511,15 @@ def _instrumented_obj(
     original_obj: Spyable,
     stub_obj: Spyable,
     strict: bool = True,
+    **spy_options,
 ) -> Spyable:
     if isclass(original_obj):
-        # TODO: implement spying on classes and class methods
+        # The methods of the class are instrumented by `StubPlan`
         _check_if_class_is_instrumentable(original_obj, stub_obj, strict)
         return stub_obj
     elif callable(original_obj) and callable(stub_obj):
         _check_if_function_is_instrumentable(original_obj, stub_obj, strict)
-        return _spy_function(stub_obj)
+        return _spy_function(stub_obj, **spy_options)
     elif callable(original_obj) and not callable(stub_obj):
         raise ValueError(
             f"Provided stub for Callable {original_obj.__name__} of type "
@@ -143,11 +531,196 @@ def _instrumented_obj(
         )
 
 
+def _module_ids() -> frozenset[int]:
+    """Identifies the modules in `sys.modules`, to tell when it changed."""
+    return frozenset(map(id, list(sys.modules.values())))
+
+
+class StubPlan:
+    """
+    A set of stubs compiled once and applied cheaply any number of times.
+
+    Compiling a plan validates the targets, checks the stubs' signatures,
+    creates the spies and resolves where each target is bound. Applying the
+    plan only resets the spies' call logs and rebinds the targets. Binding
+    locations are resolved again only when a module has been added to, removed
+    from or replaced in `sys.modules`.
+
+    Example usage:
+
+    ```
+    import my_module
+
+    plan = StubPlan((my_module.test_function, lambda x: 42))
+
+    def test_something():
+        with plan.apply():
+            assert my_module.test_function("abc") == 42
+    ```
+
+    Accepts the same options as `stub`.
+    """
+
+    def __init__(
+        self,
+        *targets: StubTarget,
+        strict: bool = True,
+        deep: bool = False,
+        scope: Iterable[str] | None = None,
+        **spy_options,
+    ):
+        if spy_options.get("sink") is not None and len(targets) > 1:
+            raise ValueError(
+                "A sink cannot be shared by several targets: pybond expected "
+                "a single target to stream to the sink."
+            )
+        self.deep = deep
+        self.scope = None if scope is None else tuple(scope)
+        self.replacements = [
+            (target, _instrumented_obj(target, stub_obj, strict, **spy_options))
+            for target, stub_obj in targets
+        ]
+        self.class_attributes = [
+            (new_obj, _spied_class_attributes(new_obj, **spy_options))
+            for _, new_obj in self.replacements
+            if isclass(new_obj)
+        ]
+        self.spies = [
+            new_obj
+            for _, new_obj in self.replacements
+            if hasattr(new_obj, "call_log")
+        ] + [
+            spied
+            for _, attrs in self.class_attributes
+            for attr in attrs.values()
+            for spied in _spies_of_class_attribute(attr)
+        ]
+        self._resolve_bindings()
+
+    @classmethod
+    def of_spies(cls, *targets: SpyTarget, **spy_options) -> "StubPlan":
+        """Compiles a plan which spies on the given targets."""
+        return cls(*[(t, t) for t in targets], **spy_options)
+
+    def _resolve_bindings(self) -> None:
+        self._module_ids = _module_ids()
+        self._bindings = resolve_bindings(
+            target for target, _ in self.replacements
+        )
+
+    def reset(self) -> None:
+        """Clears the call logs of every spy in the plan."""
+        for spied in self.spies:
+            call_log(spied).clear()
+
+    @contextmanager
+    def apply(self):
+        """
+        Context manager which applies the plan, with fresh call logs.
+        """
+        if _module_ids() != self._module_ids:
+            self._resolve_bindings()
+        self.reset()
+        with PatchJournal.context() as m:
+            try:
+                for cls, attrs in self.class_attributes:
+                    for name, attr in attrs.items():
+                        m.setattr(cls, name, attr)
+
+                # The following covers imports in the form:
+                #     `import some_module`
+                # as well as bound imports in the form:
+                #     `from some_module import some_object`
+                for (target, new_obj), bindings in zip(
+                    self.replacements,
+                    self._bindings,
+                ):
+                    rebind(m, target, new_obj, bindings)
+
+                # Fall back to setting the attribute on the target's own
+                # module in case the binding index did not know about it.
+                for target, new_obj in self.replacements:
+                    module = sys.modules[target.__module__]
+                    if getattr(module, target.__name__, None) is not new_obj:
+                        m.setattr(
+                            target=module,
+                            name=target.__name__,
+                            value=new_obj,
+                        )
+                        binding_index().bind(
+                            vars(module), target.__name__, new_obj
+                        )
+
+                if self.deep:
+                    deep_rebind(m, self.replacements, self.scope)
+
+                yield
+            finally:
+                for spied in self.spies:
+                    call_log(spied).close()
+
+
 @contextmanager
-def stub(*targets: StubTarget, strict: bool = True):
+def stub(
+    *targets: StubTarget,
+    strict: bool = True,
+    capture: CapturePolicy = "deep",
+    max_calls: int | None = None,
+    threadsafe: bool = False,
+    sink: CallSink | str | PathLike | None = None,
+    sample: float | None = None,
+    sample_every: int | None = None,
+    record: RecordMode = "full",
+    processes: bool = False,
+    timing: bool = False,
+    deep: bool = False,
+    scope: Iterable[str] | None = None,
+):
     """
     Context manager which takes a list of targets to stub and spy on.
 
+    The `capture` policy controls how the arguments of each call are recorded:
+    `"none"`, `"reference"`, `"shallow"`, `"deep"` (the default) or a snapshot
+    function called with the list of positional arguments and the dict of
+    keyword arguments.
+
+    When `max_calls` is given, only the last `max_calls` calls to each target
+    are retained, although calls are still counted exactly.
+
+    When `threadsafe` is true, calls made from different threads are recorded
+    in per-thread buffers which are merged, in call order, when the calls are
+    read.
+
+    When a `sink` (a `pybond.sinks.CallSink` or a path, written with a
+    `pybond.sinks.BinarySink`) is given, every call is streamed to it instead
+    of being kept in memory, and `calls` returns a lazy iterator reading the
+    calls back from the sink. A sink can only be given for a single target.
+
+    For functions called very often, `sample` records each call with the given
+    probability, and `sample_every` records every n-th call. Unsampled calls
+    are counted, but their arguments are not captured.
+
+    With `record="count"`, spies only count calls and errors, and retain no
+    arguments or return values: only `times_called` and `was_called` can be
+    used on them. With `record="columnar"`, each argument and the return value
+    are stored in their own column, in typed arrays for ints and floats, and
+    `column` gives vectorized aggregates over them.
+
+    With `processes=True`, calls made in child processes forked while the stub
+    is applied (such as `multiprocessing` or `ProcessPoolExecutor` workers
+    using the "fork" start method) are sent back to the parent and recorded
+    too.
+
+    With `timing=True`, each recorded call also carries its `start_ns` and
+    `duration_ns`, and `latency` gives a histogram of the call durations.
+    Calls are not timed by default.
+
+    By default, only module-level names bound to a target are replaced. With
+    `deep=True`, references held in dicts, class attributes, closures, default
+    arguments and `functools.partial` objects are replaced as well. `scope`
+    restricts this traversal to the given package prefixes (for example
+    `["my_package"]`), which keeps it fast.
+
     Example usage:
 
     ```
@@ -158,32 +731,33 @@ def stub(*targets: StubTarget, strict: bool = True):
         function_calls = calls(my_module.test_function)
     ```
     """
-    with MonkeyPatch.context() as m:
-        try:
-            for target, stub_obj in targets:
-                new_obj = _instrumented_obj(target, stub_obj, strict)
-
-                # The following only covers imports in the form:
-                #     `import some_module`
-                m.setattr(
-                    target=sys.modules[target.__module__],
-                    name=target.__name__,
-                    value=new_obj,
-                )
-
-                # The following covers bound imports in the form:
-                #     `from some_module import some_object`
-                replace_bound_references_in_memory(m, target, new_obj)
-
-            yield
-        except Exception:
-            raise
+    spy_options = {
+        "capture": capture,
+        "max_calls": max_calls,
+        "threadsafe": threadsafe,
+        "sink": sink,
+        "sample": sample,
+        "sample_every": sample_every,
+        "record": record,
+        "processes": processes,
+        "timing": timing,
+    }
+    with StubPlan(
+        *targets,
+        strict=strict,
+        deep=deep,
+        scope=scope,
+        **spy_options,
+    ).apply():
+        yield
 
 
 @contextmanager
-def spy(*targets: SpyTarget):
+def spy(*targets: SpyTarget, **spy_options):
     """
-    Context manager which takes a list of targets to spy on.
+    Context manager which takes a list of targets to spy on. Accepts the same
+    options as `stub` (`capture`, `max_calls`, `threadsafe`, `sink`, `sample`,
+    `sample_every`, `record`, `processes`, `timing`, `deep`, `scope`).
 
     Example usage:
 
@@ -194,5 +768,5 @@ def spy(*targets: SpyTarget):
         function_calls = calls(my_module.test_function)
     ```
     """
-    with stub(*[(t, t) for t in targets]):
+    with stub(*[(t, t) for t in targets], **spy_options):
         yield
@@ -0,0 +1,175 @@
+"""
+Structural matchers for the arguments of recorded calls.
+
+A pattern is any value. Matchers (`ANY`, `instance_of`, `satisfies`,
+`has_entries`) match values structurally, lists and tuples match element-wise,
+dicts match key-by-key, and every other value matches by equality. Patterns
+are compiled once into a predicate, so matching a call log is a single pass.
+
+Example usage:
+
+```
+from pybond.matchers import ANY, has_entries, instance_of
+
+assert called_with_matching(
+    my_module.save,
+    args=[has_entries(id=instance_of(int)), ANY],
+)
+```
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from typing import Any, Callable
+
+from pybond.types import FunctionCall
+
+Predicate = Callable[[Any], bool]
+
+
+class Matcher(ABC):
+    """Base class for matchers. Subclasses compile to a predicate."""
+
+    @abstractmethod
+    def compile(self) -> Predicate:
+        ...
+
+    def matches(self, value: Any) -> bool:
+        return self.compile()(value)
+
+
+class _Any(Matcher):
+    def compile(self) -> Predicate:
+        return lambda _: True
+
+    def __repr__(self) -> str:
+        return "ANY"
+
+
+ANY = _Any()
+
+
+class instance_of(Matcher):
+    """Matches instances of any of the given types."""
+
+    def __init__(self, *types: type):
+        if not types or not all(isinstance(t, type) for t in types):
+            raise ValueError(
+                f"Invalid types {types!r}: pybond expected one or more types."
+            )
+        self.types = types
+
+    def compile(self) -> Predicate:
+        types = self.types
+        return lambda value: isinstance(value, types)
+
+    def __repr__(self) -> str:
+        return f"instance_of({', '.join(t.__qualname__ for t in self.types)})"
+
+
+class satisfies(Matcher):
+    """Matches values for which `predicate` returns a truthy value."""
+
+    def __init__(self, predicate: Predicate):
+        if not callable(predicate):
+            raise ValueError(
+                f"Invalid predicate {predicate!r}: pybond expected a callable."
+            )
+        self.predicate = predicate
+
+    def compile(self) -> Predicate:
+        predicate = self.predicate
+        return lambda value: bool(predicate(value))
+
+    def __repr__(self) -> str:
+        return f"satisfies({self.predicate!r})"
+
+
+class has_entries(Matcher):
+    """
+    Matches mappings containing at least the given entries, whose values are
+    themselves patterns. Other keys are ignored.
+    """
+
+    def __init__(self, entries: Mapping | None = None, **kwargs: Any):
+        self.entries = {**(entries or {}), **kwargs}
+
+    def compile(self) -> Predicate:
+        entries = [
+            (key, compile_pattern(pattern))
+            for key, pattern in self.entries.items()
+        ]
+        missing = object()
+
+        def match(value: Any) -> bool:
+            if not isinstance(value, Mapping):
+                return False
+            for key, predicate in entries:
+                item = value.get(key, missing)
+                if item is missing or not predicate(item):
+                    return False
+            return True
+
+        return match
+
+    def __repr__(self) -> str:
+        return f"has_entries({self.entries!r})"
+
+
+def _contains_matcher(pattern: Any) -> bool:
+    if isinstance(pattern, Matcher):
+        return True
+    elif isinstance(pattern, (list, tuple)):
+        return any(map(_contains_matcher, pattern))
+    elif isinstance(pattern, dict):
+        return any(map(_contains_matcher, pattern.values()))
+    return False
+
+
+def compile_pattern(pattern: Any) -> Predicate:
+    """Compiles a pattern into a predicate over values."""
+    if isinstance(pattern, Matcher):
+        return pattern.compile()
+    elif not _contains_matcher(pattern):
+        return lambda value: value == pattern
+    elif isinstance(pattern, (list, tuple)):
+        sequence_type = type(pattern)
+        items = [compile_pattern(item) for item in pattern]
+
+        def match_sequence(value: Any) -> bool:
+            return (
+                isinstance(value, sequence_type)
+                and len(value) == len(items)
+                and all(predicate(v) for predicate, v in zip(items, value))
+            )
+
+        return match_sequence
+    entries = {key: compile_pattern(item) for key, item in pattern.items()}
+
+    def match_dict(value: Any) -> bool:
+        return (
+            isinstance(value, Mapping)
+            and value.keys() == entries.keys()
+            and all(predicate(value[k]) for k, predicate in entries.items())
+        )
+
+    return match_dict
+
+
+def compile_call_pattern(
+    args: Any = None,
+    kwargs: Any = None,
+) -> Callable[[FunctionCall], bool]:
+    """
+    Compiles patterns for the `args` and `kwargs` of a call into a predicate
+    over call records. A pattern of None matches anything.
+    """
+    match_args = None if args is None else compile_pattern(args)
+    match_kwargs = None if kwargs is None else compile_pattern(kwargs)
+
+    def match(record: FunctionCall) -> bool:
+        return (match_args is None or match_args(record["args"])) and (
+            match_kwargs is None or match_kwargs(record["kwargs"])
+        )
+
+    return match
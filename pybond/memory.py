@@ -1,21 +1,302 @@
-from gc import collect, get_referrers
-from typing import Any
+import operator
+import sys
+from functools import partial
+from inspect import isclass, isfunction
+from typing import Any, Iterable, Tuple
 
-from pytest import MonkeyPatch
+from pybond.patch import PatchJournal
+
+Binding = Tuple[dict, str]
 
 
 def _is_referrer_a_module(d: dict) -> bool:
     return isinstance(d, dict) and "__loader__" in d.keys()
 
 
+def _module_namespace(module: Any) -> dict | None:
+    try:
+        namespace = vars(module)
+    except TypeError:
+        return None
+    return namespace if _is_referrer_a_module(namespace) else None
+
+
+class BindingIndex:
+    """
+    An index from objects to the module-level names they are bound to.
+
+    `resolve_bindings` reads the bindings of the namespaces tracked by the
+    index, and only scans the namespaces of untracked modules. Bindings are
+    verified on lookup, which means stale entries are harmless, but names
+    bound in a tracked namespace after it was indexed are only found once it
+    is tracked again.
+    """
+
+    def __init__(self):
+        self._bindings: dict[int, dict[Tuple[int, str], Binding]] = {}
+        self._namespaces: dict[int, dict] = {}
+
+    def refresh(self) -> None:
+        """
+        Tracks the namespaces of every module. Known bindings are kept, so
+        that names currently patched by a stub are found again once the stub
+        is undone.
+        """
+        self._namespaces.clear()
+        for module_name, namespace in _module_namespaces():
+            self.track(module_name, namespace)
+
+    def track(self, module_name: str, namespace: dict) -> None:
+        """Index (or re-index) the namespace of a single module."""
+        self._namespaces[id(namespace)] = namespace
+        for name, value in list(namespace.items()):
+            self.bind(namespace, name, value)
+
+    def is_tracked(self, namespace: dict) -> bool:
+        return self._namespaces.get(id(namespace)) is namespace
+
+    def bind(self, namespace: dict, name: str, obj: Any) -> None:
+        """Record that `obj` is now bound to `name` in `namespace`."""
+        self._bindings.setdefault(id(obj), {})[(id(namespace), name)] = (
+            namespace,
+            name,
+        )
+
+    def lookup(self, obj: Any) -> list[Binding]:
+        """
+        Returns the `(namespace, name)` pairs where `obj` is currently bound.
+        """
+        return [
+            (namespace, name)
+            for namespace, name in self._bindings.get(id(obj), {}).values()
+            if namespace.get(name) is obj
+        ]
+
+    def clear(self) -> None:
+        self._bindings.clear()
+        self._namespaces.clear()
+
+
+_binding_index = BindingIndex()
+
+
+def binding_index() -> BindingIndex:
+    """Returns the binding index shared by every stub."""
+    return _binding_index
+
+
+def _module_namespaces() -> list[Tuple[str, dict]]:
+    """Returns the namespace of each module in `sys.modules`, once."""
+    namespaces = {}
+    for module_name, module in list(sys.modules.items()):
+        namespace = _module_namespace(module)
+        if namespace is not None:
+            namespaces.setdefault(id(namespace), (module_name, namespace))
+    return list(namespaces.values())
+
+
+def resolve_bindings(targets: Iterable[Any]) -> list[list[Binding]]:
+    """
+    Returns, for each target object, the module-level bindings referencing it.
+    Bindings in the namespaces tracked by the binding index are looked up in
+    it. All targets are resolved in a single pass over the namespaces of the
+    other modules in `sys.modules`, matching values by identity, so the cost
+    grows with the number of untracked module-level names rather than with
+    the size of the heap.
+    """
+    targets = list(targets)
+    indexes: dict[int, list[int]] = {}
+    for i, target_obj in enumerate(targets):
+        indexes.setdefault(id(target_obj), []).append(i)
+    all_bindings: list[list[Binding]] = [[] for _ in targets]
+    tracked: set[int] = set()
+    for _, namespace in _module_namespaces():
+        if _binding_index.is_tracked(namespace):
+            tracked.add(id(namespace))
+            continue
+        for name, value in list(namespace.items()):
+            for i in indexes.get(id(value), ()):
+                if targets[i] is value:
+                    all_bindings[i].append((namespace, name))
+    if tracked:
+        for target_obj, bindings in zip(targets, all_bindings):
+            bindings.extend(
+                (namespace, name)
+                for namespace, name in _binding_index.lookup(target_obj)
+                if id(namespace) in tracked
+            )
+    return all_bindings
+
+
+def rebind(
+    monkeypatch_ctx: PatchJournal,
+    target_obj: Any,
+    new_obj: Any,
+    bindings: Iterable[Binding],
+) -> None:
+    """
+    Rebinds each of the given bindings to `new_obj`, skipping bindings which
+    no longer reference `target_obj`.
+    """
+    for namespace, name in bindings:
+        if namespace.get(name) is target_obj:
+            monkeypatch_ctx.setitem(namespace, name, new_obj)
+            # Both are indexed: `target_obj` is bound again on undo
+            _binding_index.bind(namespace, name, target_obj)
+            _binding_index.bind(namespace, name, new_obj)
+
+
+def replace_bound_references(
+    monkeypatch_ctx: PatchJournal,
+    replacements: Iterable[Tuple[Any, Any]],
+) -> None:
+    """
+    Rebinds every module-level reference to each target object to its
+    replacement.
+    """
+    replacements = list(replacements)
+    all_bindings = resolve_bindings(target for target, _ in replacements)
+    for (target_obj, new_obj), bindings in zip(replacements, all_bindings):
+        rebind(monkeypatch_ctx, target_obj, new_obj, bindings)
+
+
 def replace_bound_references_in_memory(
-    monkeypatch_ctx: MonkeyPatch,
+    monkeypatch_ctx: PatchJournal,
     target_obj: Any,
     new_obj: Any,
 ) -> None:
-    collect()  # Perform GC before checking for references in memory
-    for reference in get_referrers(target_obj):
-        if _is_referrer_a_module(reference):
-            for k, v in reference.items():
-                if v is target_obj:
-                    monkeypatch_ctx.setitem(reference, k, new_obj)
+    replace_bound_references(monkeypatch_ctx, [(target_obj, new_obj)])
+
+
+def _in_scope(module_name: Any, scope: Iterable[str] | None) -> bool:
+    if scope is None:
+        return True
+    elif not isinstance(module_name, str):
+        return False
+    return any(
+        module_name == prefix or module_name.startswith(prefix + ".")
+        for prefix in scope
+    )
+
+
+def _is_traversable(obj: Any, scope: Iterable[str] | None) -> bool:
+    if isinstance(obj, (dict, partial)):
+        return True
+    elif isclass(obj) or isfunction(obj):
+        return _in_scope(getattr(obj, "__module__", None), scope)
+    return isinstance(obj, (staticmethod, classmethod))
+
+
+def deep_rebind(
+    monkeypatch_ctx: PatchJournal,
+    replacements: Iterable[Tuple[Any, Any]],
+    scope: Iterable[str] | None = None,
+) -> None:
+    """
+    Rebinds references to each target object which are not module-level
+    names: values of dicts, class attributes, closure cells, default
+    arguments and the function and arguments of `functools.partial` objects.
+
+    All targets are replaced in a single traversal starting from the module
+    namespaces in `sys.modules`. When `scope` is given, only modules, classes
+    and functions whose module is one of the given package prefixes (or a
+    submodule of one) are traversed.
+    """
+    scope = None if scope is None else tuple(scope)
+    new_objs = {
+        id(target_obj): (target_obj, new_obj)
+        for target_obj, new_obj in replacements
+        if target_obj is not new_obj
+    }
+    if not new_objs:
+        return
+
+    def replacement(value: Any) -> Any:
+        pair = new_objs.get(id(value))
+        if pair is not None and pair[0] is value:
+            return pair[1]
+        return value
+
+    # Replacement objects are never traversed: spies hold the target in their
+    # own closure.
+    seen = {id(new_obj) for _, new_obj in new_objs.values()}
+    stack = [
+        namespace
+        for module_name, module in list(sys.modules.items())
+        if _in_scope(module_name, scope)
+        and (namespace := _module_namespace(module)) is not None
+    ]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        children: list[Any] = []
+        if isinstance(obj, dict):
+            for key, value in list(obj.items()):
+                new_value = replacement(value)
+                if new_value is not value:
+                    monkeypatch_ctx.setitem(obj, key, new_value)
+                else:
+                    children.append(value)
+        elif isclass(obj):
+            for name, value in list(vars(obj).items()):
+                new_value = replacement(value)
+                if new_value is not value:
+                    monkeypatch_ctx.setattr(obj, name, new_value)
+                elif isinstance(value, (staticmethod, classmethod)):
+                    new_func = replacement(value.__func__)
+                    if new_func is not value.__func__:
+                        monkeypatch_ctx.setattr(obj, name, type(value)(new_func))
+                    else:
+                        children.append(value.__func__)
+                else:
+                    children.append(value)
+        elif isfunction(obj):
+            for cell in obj.__closure__ or ():
+                try:
+                    value = cell.cell_contents
+                except ValueError:
+                    continue
+                new_value = replacement(value)
+                if new_value is not value:
+                    monkeypatch_ctx.setattr(cell, "cell_contents", new_value)
+                else:
+                    children.append(value)
+            defaults = obj.__defaults__ or ()
+            new_defaults = tuple(map(replacement, defaults))
+            if any(map(operator.is_not, defaults, new_defaults)):
+                monkeypatch_ctx.setattr(obj, "__defaults__", new_defaults)
+            children.extend(defaults)
+            for name, value in list((obj.__kwdefaults__ or {}).items()):
+                new_value = replacement(value)
+                if new_value is not value:
+                    monkeypatch_ctx.setitem(obj.__kwdefaults__, name, new_value)
+                else:
+                    children.append(value)
+        elif isinstance(obj, partial):
+            func, args, keywords, attributes = obj.__reduce__()[2]
+            new_func = replacement(func)
+            new_args = tuple(map(replacement, args))
+            new_keywords = {
+                name: replacement(value)
+                for name, value in (keywords or {}).items()
+            }
+            if (
+                new_func is not func
+                or any(map(operator.is_not, args, new_args))
+                or any(
+                    new_keywords[name] is not value
+                    for name, value in (keywords or {}).items()
+                )
+            ):
+                monkeypatch_ctx.setstate(
+                    obj,
+                    (new_func, new_args, new_keywords or None, attributes),
+                )
+            children.extend([func, *args, *(keywords or {}).values()])
+        stack.extend(
+            child
+            for child in children
+            if id(child) not in seen and _is_traversable(child, scope)
+        )
@@ -0,0 +1,85 @@
+"""
+A lightweight journal of attribute and item patches, used instead of pytest's
+`MonkeyPatch` so that importing pybond does not import pytest.
+"""
+
+from contextlib import contextmanager
+from inspect import isclass
+from typing import Any, Callable, MutableMapping
+
+_NOTSET = object()
+
+
+def _undo_setattr(target: Any, name: str, old_value: Any) -> None:
+    if old_value is _NOTSET:
+        delattr(target, name)
+    else:
+        setattr(target, name, old_value)
+
+
+def _undo_setitem(mapping: MutableMapping, key: Any, old_value: Any) -> None:
+    if old_value is _NOTSET:
+        mapping.pop(key, None)
+    else:
+        mapping[key] = old_value
+
+
+class PatchJournal:
+    """
+    Records `setattr` and `setitem` operations so that they can be undone in
+    reverse order.
+    """
+
+    def __init__(self):
+        self._undo: list[Callable[[], None]] = []
+
+    def setattr(
+        self,
+        target: Any,
+        name: str,
+        value: Any,
+        raising: bool = True,
+    ) -> None:
+        """
+        Sets an attribute. Like `MonkeyPatch.setattr`, raises an
+        AttributeError if the attribute does not exist, unless `raising` is
+        false.
+        """
+        if raising and not hasattr(target, name):
+            raise AttributeError(f"{target!r} has no attribute {name!r}")
+        if isclass(target):
+            # Only restore what the class itself defines, so that inherited
+            # attributes are not copied onto the class when undoing.
+            old_value = vars(target).get(name, _NOTSET)
+        else:
+            old_value = getattr(target, name, _NOTSET)
+        setattr(target, name, value)
+        self._undo.append(lambda: _undo_setattr(target, name, old_value))
+
+    def setitem(self, mapping: MutableMapping, key: Any, value: Any) -> None:
+        old_value = mapping.get(key, _NOTSET)
+        mapping[key] = value
+        self._undo.append(lambda: _undo_setitem(mapping, key, old_value))
+
+    def setstate(self, obj: Any, state: Any) -> None:
+        """
+        Replaces the state of an object which supports `__setstate__` and
+        `__reduce__`, such as `functools.partial`.
+        """
+        old_state = obj.__reduce__()[2]
+        obj.__setstate__(state)
+        self._undo.append(lambda: obj.__setstate__(old_state))
+
+    def undo(self) -> None:
+        """Undoes every recorded operation, most recent first."""
+        while self._undo:
+            self._undo.pop()()
+
+    @classmethod
+    @contextmanager
+    def context(cls):
+        journal = cls()
+        try:
+            yield journal
+        finally:
+            journal.undo()
@@ -0,0 +1,96 @@
+"""
+A pytest plugin which lets spies and stubs be installed once per module or
+session, while their call logs are reset before every test.
+
+Example usage:
+
+```
+from pybond.pytest_plugin import spy_fixture, stub_fixture
+
+network = stub_fixture(
+    (other_package.make_a_network_request, mock_make_a_network_request),
+    scope="session",
+)
+spied_foo = spy_fixture(my_module.foo)
+
+
+def test_bar(network, spied_foo):
+    ...
+```
+"""
+
+from typing import Iterator
+
+import pytest
+
+from pybond.james import StubPlan
+from pybond.memory import BindingIndex, binding_index
+from pybond.types import SpyTarget, StubTarget
+
+_active_plans: list[StubPlan] = []
+
+
+def _plan_fixture(plan_factory, scope: str):
+    @pytest.fixture(scope=scope)
+    def plan_fixture():
+        plan = plan_factory()
+        with plan.apply():
+            _active_plans.append(plan)
+            try:
+                yield plan
+            finally:
+                _active_plans.remove(plan)
+
+    return plan_fixture
+
+
+def stub_fixture(
+    *targets: StubTarget,
+    scope: str = "module",
+    strict: bool = True,
+    **spy_options,
+):
+    """
+    Returns a fixture which applies the given stubs once per `scope`. The
+    fixture's value is the applied `StubPlan`. Accepts the same options as
+    `stub`.
+    """
+    return _plan_fixture(
+        lambda: StubPlan(*targets, strict=strict, **spy_options),
+        scope,
+    )
+
+
+def spy_fixture(*targets: SpyTarget, scope: str = "module", **spy_options):
+    """
+    Returns a fixture which spies on the given targets once per `scope`. The
+    fixture's value is the applied `StubPlan`. Accepts the same options as
+    `spy`.
+    """
+    return _plan_fixture(
+        lambda: StubPlan.of_spies(*targets, **spy_options),
+        scope,
+    )
+
+
+@pytest.fixture(scope="session")
+def pybond_binding_index() -> Iterator[BindingIndex]:
+    """
+    The binding index shared by every stub in the session. It tracks every
+    module imported when the fixture is first requested, so that stubs look
+    up their bindings in those modules instead of scanning them again. It is
+    cleared when the session ends.
+    """
+    index = binding_index()
+    index.refresh()
+    try:
+        yield index
+    finally:
+        index.clear()
+
+
+@pytest.fixture(autouse=True)
+def _pybond_reset_call_logs():
+    for plan in _active_plans:
+        plan.reset()
+    yield
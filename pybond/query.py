@@ -0,0 +1,158 @@
+"""
+Lazy, chainable queries over the calls recorded by a spy.
+
+Example usage:
+
+```
+from pybond.query import query
+
+with spy(my_module.foo):
+    ...
+    assert query(my_module.foo).where(args=[42]).exists()
+    errors = query(my_module.foo).where(lambda c: c["error"]).count()
+```
+"""
+
+from inspect import ismethod
+from typing import Any, Callable, Hashable, Iterable, Iterator
+
+from pybond.james import call_log
+from pybond.matchers import _contains_matcher, compile_call_pattern
+from pybond.types import FunctionCall, Spyable
+
+
+class CallQuery:
+    """
+    A lazy view over the calls of a spied function. `where` and `map` return
+    new queries without reading the call log; the calls are only read when
+    the query is iterated or aggregated, and `first` and `exists` stop at the
+    first result.
+
+    Queries which only filter on exact `args` or `kwargs` values are answered
+    by `count` and `exists` from the call log's index when it is available.
+    """
+
+    def __init__(
+        self,
+        f: Spyable,
+        steps: tuple[tuple[str, Callable[[Any], Any]], ...] = (),
+        lookups: tuple[tuple[str, Any], ...] | None = (),
+    ):
+        self._f = f
+        self._steps = steps
+        # Exact field lookups, kept while the query only has exact filters
+        self._lookups = lookups
+
+    def _records(self) -> Iterable[FunctionCall]:
+        records = call_log(self._f).records()
+        if ismethod(self._f):
+            receiver = self._f.__self__
+            return (
+                record for record in records if record.receiver is receiver
+            )
+        return records
+
+    def __iter__(self) -> Iterator[Any]:
+        items: Iterable[Any] = self._records()
+        for kind, function in self._steps:
+            if kind == "where":
+                items = filter(function, items)
+            else:
+                items = map(function, items)
+        return iter(items)
+
+    def _chain(
+        self,
+        kind: str,
+        function: Callable[[Any], Any],
+        lookups: tuple[tuple[str, Any], ...] | None = None,
+    ) -> "CallQuery":
+        return CallQuery(
+            self._f,
+            self._steps + ((kind, function),),
+            (
+                self._lookups + lookups
+                if self._lookups is not None and lookups is not None
+                else None
+            ),
+        )
+
+    def _is_indexable(self) -> bool:
+        return (
+            self._lookups is not None
+            and len(self._lookups) == 1
+            and not ismethod(self._f)
+        )
+
+    def where(
+        self,
+        predicate: Callable[[Any], Any] | None = None,
+        *,
+        args: Any = None,
+        kwargs: Any = None,
+    ) -> "CallQuery":
+        """
+        Keeps the items for which `predicate` is truthy. `args` and `kwargs`
+        are patterns (see `pybond.matchers`) matched against the fields of
+        call records, and can only be used before `map`.
+        """
+        if args is None and kwargs is None:
+            if predicate is None:
+                return self
+            return self._chain("where", predicate)
+        if any(kind == "map" for kind, _ in self._steps):
+            raise ValueError(
+                "Invalid query: pybond expected `args` and `kwargs` filters "
+                "to come before `map`."
+            )
+        match = compile_call_pattern(args, kwargs)
+        lookups: tuple[tuple[str, Any], ...] | None = None
+        if predicate is None and not _contains_matcher([args, kwargs]):
+            lookups = tuple(
+                (field, value)
+                for field, value in [("args", args), ("kwargs", kwargs)]
+                if value is not None
+            )
+        query = self._chain("where", match, lookups)
+        return query if predicate is None else query._chain("where", predicate)
+
+    def map(self, function: Callable[[Any], Any]) -> "CallQuery":
+        """Transforms each item with `function`."""
+        return self._chain("map", function)
+
+    def count(self) -> int:
+        """Returns the number of items."""
+        if self._is_indexable():
+            ((field, value),) = self._lookups
+            return call_log(self._f).count(field, value)
+        return sum(1 for _ in self)
+
+    def exists(self) -> bool:
+        """Returns whether there is at least one item."""
+        if self._is_indexable():
+            return self.count() > 0
+        for _ in self:
+            return True
+        return False
+
+    def first(self, default: Any = None) -> Any:
+        """Returns the first item, or `default` if there is none."""
+        return next(iter(self), default)
+
+    def group_by(self, key: Callable[[Any], Hashable]) -> dict[Hashable, list]:
+        """Returns the items grouped by `key`, in order of first appearance."""
+        groups: dict[Hashable, list] = {}
+        for item in self:
+            groups.setdefault(key(item), []).append(item)
+        return groups
+
+
+def query(f: Spyable) -> CallQuery:
+    """
+    Takes one arg, a function that has previously been spied. Returns a lazy
+    query over its recorded calls.
+
+    If the function has not been spied, raises an exception.
+    """
+    call_log(f)
+    return CallQuery(f)
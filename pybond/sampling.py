@@ -0,0 +1,55 @@
+from itertools import count
+from random import Random
+from typing import Callable
+
+Sampler = Callable[[], bool]
+
+
+def _every_nth(n: int) -> Sampler:
+    calls = count()
+
+    def sampled() -> bool:
+        return next(calls) % n == 0
+
+    return sampled
+
+
+def _with_probability(p: float) -> Sampler:
+    random = Random().random
+
+    def sampled() -> bool:
+        return random() < p
+
+    return sampled
+
+
+def sampler(
+    sample: float | None = None,
+    sample_every: int | None = None,
+) -> Sampler | None:
+    """
+    Returns a predicate deciding whether each call should be recorded: either
+    with probability `sample`, or deterministically for every `sample_every`-th
+    call (starting with the first one). Returns None when every call should be
+    recorded.
+    """
+    if sample is not None and sample_every is not None:
+        raise ValueError(
+            "sample and sample_every cannot be combined: pybond expected at "
+            "most one sampling mode."
+        )
+    elif sample is not None:
+        if not 0 < sample <= 1:
+            raise ValueError(
+                f"Invalid sample {sample!r}: pybond expected a probability in "
+                "(0, 1]."
+            )
+        return None if sample == 1 else _with_probability(sample)
+    elif sample_every is not None:
+        if not isinstance(sample_every, int) or sample_every < 1:
+            raise ValueError(
+                f"Invalid sample_every {sample_every!r}: pybond expected a "
+                "positive integer."
+            )
+        return None if sample_every == 1 else _every_nth(sample_every)
+    return None
@@ -0,0 +1,205 @@
+"""
+Sinks stream the calls recorded by a spy to disk instead of keeping them in
+memory, which keeps memory use flat for spies left on long-running code.
+"""
+
+import json
+import pickle
+import struct
+from abc import ABC, abstractmethod
+from os import PathLike, fspath
+from threading import Lock
+from typing import Any, BinaryIO, Iterator
+
+from pybond.types import FunctionCall
+
+_BUFFER_SIZE = 1 << 16
+_FRAME_HEADER = struct.Struct("<I")
+
+
+def portable_error(error: Any) -> Any:
+    """
+    Returns a picklable version of an error recorded as a `sys.exc_info()`
+    tuple: tracebacks are dropped, and exceptions which cannot be pickled are
+    replaced by the name of their type and their repr.
+    """
+    if error is None:
+        return None
+    exc_type, exc_value, _ = error
+    try:
+        pickle.dumps((exc_type, exc_value))
+    except Exception:
+        return (exc_type.__qualname__, repr(exc_value), None)
+    return (exc_type, exc_value, None)
+
+
+def _picklable(value: Any) -> Any:
+    try:
+        pickle.dumps(value)
+    except Exception:
+        return repr(value)
+    return value
+
+
+def dumps_portable(fields: tuple) -> bytes:
+    """
+    Pickles a tuple of record fields. Fields which cannot be pickled are
+    replaced by their repr.
+    """
+    try:
+        return pickle.dumps(fields, pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return pickle.dumps(
+            tuple(map(_picklable, fields)),
+            pickle.HIGHEST_PROTOCOL,
+        )
+
+
+class CallSink(ABC):
+    """
+    Base class for sinks. Records are written through a buffered writer and
+    read back lazily, one at a time.
+    """
+
+    def __init__(self, path: str | PathLike):
+        self.path = fspath(path)
+        self._lock = Lock()
+        self._file: BinaryIO | None = open(self.path, "wb", _BUFFER_SIZE)
+
+    @abstractmethod
+    def _encode(self, record: FunctionCall) -> bytes:
+        ...
+
+    @abstractmethod
+    def _decode(self, file: BinaryIO) -> Iterator[FunctionCall]:
+        ...
+
+    @abstractmethod
+    def roundtrip(self, value: Any) -> Any:
+        """
+        Returns `value` as it would be read back after being written, so that
+        expected values can be compared with the records read from the sink.
+        """
+
+    def write(self, record: FunctionCall) -> None:
+        data = self._encode(record)
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "ab", _BUFFER_SIZE)
+            self._file.write(data)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def clear(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+            self._file = open(self.path, "wb", _BUFFER_SIZE)
+
+    def read(self) -> Iterator[FunctionCall]:
+        """
+        Returns a lazy iterator over the records written so far. Pending
+        writes are flushed first.
+        """
+        self.flush()
+        return self._read()
+
+    def _read(self) -> Iterator[FunctionCall]:
+        with open(self.path, "rb") as file:
+            yield from self._decode(file)
+
+
+class JsonLinesSink(CallSink):
+    """
+    Writes one JSON object per call. Values which are not JSON serializable
+    are written as their repr, and errors as `[exception type name, message]`.
+    """
+
+    def _encode(self, record: FunctionCall) -> bytes:
+        error = record.error
+        if error is not None:
+            error = [error[0].__qualname__, str(error[1])]
+        data = {
+            "args": record.args,
+            "kwargs": record.kwargs,
+            "error": error,
+            "return": record.return_value,
+            "seq": record.seq,
+        }
+        if record.yields is not None:
+            data["yields"] = record.yields
+        line = json.dumps(data, default=repr)
+        return line.encode() + b"\n"
+
+    def roundtrip(self, value: Any) -> Any:
+        return json.loads(json.dumps(value, default=repr))
+
+    def _decode(self, file: BinaryIO) -> Iterator[FunctionCall]:
+        for line in file:
+            data = json.loads(line)
+            record = FunctionCall(
+                data["args"],
+                data["kwargs"],
+                data["error"],
+                data["return"],
+            )
+            record.seq = data["seq"]
+            record.yields = data.get("yields")
+            yield record
+
+
+class BinarySink(CallSink):
+    """
+    Writes each call as a length-prefixed pickle. Values which cannot be
+    pickled are written as their repr.
+    """
+
+    def _encode(self, record: FunctionCall) -> bytes:
+        fields = (
+            record.args,
+            record.kwargs,
+            portable_error(record.error),
+            record.return_value,
+            record.seq,
+            record.yields,
+        )
+        payload = dumps_portable(fields)
+        return _FRAME_HEADER.pack(len(payload)) + payload
+
+    def roundtrip(self, value: Any) -> Any:
+        return pickle.loads(dumps_portable((value,)))[0]
+
+    def _decode(self, file: BinaryIO) -> Iterator[FunctionCall]:
+        while header := file.read(_FRAME_HEADER.size):
+            (size,) = _FRAME_HEADER.unpack(header)
+            args, kwargs, error, return_value, seq, yields = pickle.loads(
+                file.read(size)
+            )
+            record = FunctionCall(args, kwargs, error, return_value)
+            record.seq = seq
+            record.yields = yields
+            yield record
+
+
+def as_sink(sink: CallSink | str | PathLike) -> CallSink:
+    """
+    Paths are written with a `BinarySink`, which reads back the values that
+    were recorded rather than their JSON representation.
+    """
+    if isinstance(sink, CallSink):
+        return sink
+    elif isinstance(sink, (str, PathLike)):
+        return BinarySink(sink)
+    raise ValueError(
+        f"Sink of type {type(sink)} is invalid: pybond expected a CallSink "
+        "or a path."
+    )
@@ -0,0 +1,101 @@
+_SUB_BUCKET_BITS = 4
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS
+
+
+def _bucket_index(value: int) -> int:
+    """
+    Values below `_SUB_BUCKETS` get a bucket each. Above that, each power of
+    two is split into `_SUB_BUCKETS` linear buckets, which bounds the relative
+    error of a bucket to 1 / `_SUB_BUCKETS`.
+    """
+    if value < _SUB_BUCKETS:
+        return value
+    exponent = value.bit_length() - _SUB_BUCKET_BITS - 1
+    return (exponent << _SUB_BUCKET_BITS) + (value >> exponent)
+
+
+def _bucket_upper_bound(index: int) -> int:
+    if index < _SUB_BUCKETS:
+        return index
+    exponent = (index >> _SUB_BUCKET_BITS) - 1
+    sub_bucket = _SUB_BUCKETS + (index & (_SUB_BUCKETS - 1))
+    return ((sub_bucket + 1) << exponent) - 1
+
+
+class LatencyHistogram:
+    """
+    A streaming histogram of call durations, in nanoseconds. Durations are
+    counted in log-linear buckets, so memory use does not grow with the number
+    of calls and percentiles are accurate to within about 6%.
+    """
+
+    def __init__(self):
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns: int | None = None
+        self.max_ns: int | None = None
+
+    def add(self, duration_ns: int) -> None:
+        index = _bucket_index(duration_ns)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total_ns += duration_ns
+        if self.min_ns is None or duration_ns < self.min_ns:
+            self.min_ns = duration_ns
+        if self.max_ns is None or duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Returns a new histogram combining this one with `other`."""
+        histograms = (self, other)
+        merged = LatencyHistogram()
+        for histogram in histograms:
+            for index, count in histogram.counts.items():
+                merged.counts[index] = merged.counts.get(index, 0) + count
+        merged.count = self.count + other.count
+        merged.total_ns = self.total_ns + other.total_ns
+        merged.min_ns = min(
+            (h.min_ns for h in histograms if h.min_ns is not None),
+            default=None,
+        )
+        merged.max_ns = max(
+            (h.max_ns for h in histograms if h.max_ns is not None),
+            default=None,
+        )
+        return merged
+
+    @property
+    def mean_ns(self) -> float | None:
+        return self.total_ns / self.count if self.count else None
+
+    def percentile(self, p: float) -> int | None:
+        """
+        Returns an upper bound of the `p`-th percentile of durations (0 < p <=
+        100), or None if no durations were recorded.
+        """
+        if not 0 < p <= 100:
+            raise ValueError(
+                f"Invalid percentile {p!r}: pybond expected a number in "
+                "(0, 100]."
+            )
+        if not self.count:
+            return None
+        rank = p / 100 * self.count
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(_bucket_upper_bound(index), self.max_ns)
+        return self.max_ns
+
+    def summary(self) -> dict[str, float | int | None]:
+        return {
+            "count": self.count,
+            "min_ns": self.min_ns,
+            "mean_ns": self.mean_ns,
+            "p50_ns": self.percentile(50),
+            "p90_ns": self.percentile(90),
+            "p99_ns": self.percentile(99),
+            "max_ns": self.max_ns,
+        }
@@ -0,0 +1,113 @@
+"""
+An opt-in import hook which records module-level bindings as modules finish
+executing, so that bound imports in the form `from some_module import
+some_object` are known to the binding index as soon as they are imported.
+Stubs look up the bindings of tracked modules in the index.
+
+Modules imported before the hook was installed are scanned by each stub,
+unless they are indexed by `binding_index().refresh()`.
+"""
+
+import sys
+from contextlib import contextmanager
+from copy import copy
+from importlib.abc import MetaPathFinder
+from importlib.machinery import ModuleSpec
+from types import ModuleType
+
+from pybond.memory import binding_index
+
+
+def _track_module(module: ModuleType) -> None:
+    namespace = vars(module)
+    binding_index().track(namespace.get("__name__", module.__name__), namespace)
+
+
+class _TrackingLoader:
+    """
+    A loader which delegates to the loader found for a module, then indexes
+    the module's namespace once it has been executed. Loaders are often
+    shared (e.g. pytest's assertion rewriting hook is its own loader), so
+    they are never modified: each spec gets its own `_TrackingLoader`.
+    """
+
+    def __init__(self, loader):
+        self._loader = loader
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec: ModuleSpec) -> ModuleType | None:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        # The module keeps its original loader
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        self._loader.exec_module(module)
+        _track_module(module)
+
+
+def _tracked_spec(spec: ModuleSpec) -> ModuleSpec:
+    """Returns a copy of spec, loaded with a `_TrackingLoader`."""
+    if spec.loader is None or not hasattr(spec.loader, "exec_module"):
+        return spec
+    spec = copy(spec)
+    spec.loader = _TrackingLoader(spec.loader)
+    return spec
+
+
+class ImportTracker(MetaPathFinder):
+    """
+    A meta path finder which defers to the other finders on `sys.meta_path`
+    and indexes each module's namespace once it has been executed.
+    """
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                return _tracked_spec(spec)
+        return None
+
+
+_import_tracker = ImportTracker()
+
+
+def install_import_tracker() -> None:
+    """Installs the import tracker at the front of `sys.meta_path`."""
+    if _import_tracker not in sys.meta_path:
+        sys.meta_path.insert(0, _import_tracker)
+
+
+def uninstall_import_tracker() -> None:
+    if _import_tracker in sys.meta_path:
+        sys.meta_path.remove(_import_tracker)
+
+
+def is_import_tracker_installed() -> bool:
+    return _import_tracker in sys.meta_path
+
+
+@contextmanager
+def track_imports():
+    """
+    Context manager which tracks the bindings of modules imported within it.
+
+    Example usage:
+
+    ```
+    with track_imports():
+        import my_module
+    ```
+    """
+    installed = is_import_tracker_installed()
+    install_import_tracker()
+    try:
+        yield
+    finally:
+        if not installed:
+            uninstall_import_tracker()
@@ -1,15 +1,117 @@
-from typing import Any, Callable, Tuple, TypeAlias, TypedDict
-
-FunctionCall = TypedDict(
-    "FunctionCall",
-    {
-        "args": list[Any],
-        "kwargs": dict[str, Any],
-        "error": Any,
-        "return": Any,
-    }
-)
+from collections.abc import Iterator, Mapping
+from typing import Any, Callable, Literal, Tuple, TypeAlias
+
+
+class FunctionCall(Mapping):
+    """
+    A record of a single call to a spied function. Records are compact slotted
+    objects, but they can be read like the dicts pybond used to return
+    (`record["args"]`) and compare equal to dicts with the same keys.
+
+    Calls which returned a generator also have a `yields` key, holding the
+    items yielded so far.
+    """
+
+    __slots__ = (
+        "args",
+        "kwargs",
+        "error",
+        "return_value",
+        "seq",
+        "yields",
+        "receiver",
+    )
+
+    # Only set on the records of spies created with `timing=True`
+    start_ns: int | None = None
+    duration_ns: int | None = None
+
+    _call_keys = ("args", "kwargs", "error", "return")
+    _generator_keys = ("args", "kwargs", "error", "return", "yields")
+
+    def __init__(
+        self,
+        args: list[Any] | None,
+        kwargs: dict[str, Any] | None,
+        error: Any,
+        return_value: Any,
+        receiver: Any = None,
+    ):
+        self.args = args
+        self.kwargs = kwargs
+        self.error = error
+        self.return_value = return_value
+        # The instance (or class) a spied method was called on
+        self.receiver = receiver
+        # Global sequence number, set by thread-safe call logs
+        self.seq: int | None = None
+        self.yields: list[Any] | None = None
+
+    @property
+    def _keys(self) -> tuple[str, ...]:
+        if self.yields is None:
+            return self._call_keys
+        return self._generator_keys
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "return":
+            return self.return_value
+        elif key in self._keys:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FunctionCall):
+            return (
+                self.args == other.args
+                and self.kwargs == other.kwargs
+                and self.error == other.error
+                and self.return_value == other.return_value
+                and self.yields == other.yields
+            )
+        elif isinstance(other, Mapping):
+            return len(other) == len(self._keys) and all(
+                key in other and other[key] == self[key] for key in self._keys
+            )
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"FunctionCall({dict(self)!r})"
+
+
+class TimedFunctionCall(FunctionCall):
+    """A record of a call to a spy created with `timing=True`."""
+
+    __slots__ = ("start_ns", "duration_ns")
+
+    def __init__(
+        self,
+        args: list[Any] | None,
+        kwargs: dict[str, Any] | None,
+        error: Any,
+        return_value: Any,
+        start_ns: int,
+        duration_ns: int,
+        receiver: Any = None,
+    ):
+        super().__init__(args, kwargs, error, return_value, receiver)
+        # `time.perf_counter_ns()` when the call started, and its duration
+        self.start_ns = start_ns
+        self.duration_ns = duration_ns
+
 
 Spyable: TypeAlias = Callable | Any
 SpyTarget: TypeAlias = Spyable
 StubTarget: TypeAlias = Tuple[Spyable, Spyable]
+CapturePolicy: TypeAlias = (
+    Literal["none", "reference", "shallow", "deep"] | Callable[[Any], Any]
+)
+RecordMode: TypeAlias = Literal["full", "count", "columnar"]
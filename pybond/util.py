@@ -1,5 +1,6 @@
-from inspect import getfullargspec
-from typing import Callable
+from inspect import getfullargspec, iscoroutinefunction
+from types import FunctionType
+from typing import Callable, Hashable
 
 
 def _args_match(fsig, gsig) -> bool:
@@ -35,11 +36,15 @@ def _varkwargs_match(fsig, gsig) -> bool:
         return True
 
 
+def _coroutine_functions_match(f, g) -> bool:
+    return iscoroutinefunction(f) == iscoroutinefunction(g)
+
+
 def _fn_with_zero_arguments():
     return None
 
 
-def function_signatures_match(f, g):
+def _uncached_function_signatures_match(f, g):
     try:
         fsig = getfullargspec(f)
         gsig = getfullargspec(g)
@@ -48,6 +53,7 @@ def function_signatures_match(f, g):
             and _kwargs_match(fsig, gsig)
             and _varargs_match(fsig, gsig)
             and _varkwargs_match(fsig, gsig)
+            and _coroutine_functions_match(f, g)
         )
     except TypeError as e:
         # Some callables may not be introspectable in certain implementations of
@@ -55,7 +61,10 @@ def function_signatures_match(f, g):
         # provide no metadata about their arguments.
         if str(e) == "unsupported callable":
             if [f.__module__, f.__name__] == ["time", "time"]:
-                return function_signatures_match(_fn_with_zero_arguments, g)
+                return _uncached_function_signatures_match(
+                    _fn_with_zero_arguments,
+                    g,
+                )
             # Add other specific cases here
             else:
                 raise
@@ -63,5 +72,36 @@ def function_signatures_match(f, g):
             raise
 
 
+_MAX_CACHED_SIGNATURE_MATCHES = 4096
+_signature_match_cache: dict[tuple[Hashable, Hashable], bool] = {}
+
+
+def _signature_cache_key(f) -> Hashable | None:
+    # Only plain functions are cached: their signature is entirely determined
+    # by their code object and by which keyword-only arguments have defaults.
+    if type(f) is not FunctionType or "__signature__" in vars(f):
+        return None
+    return (f.__code__, frozenset(f.__kwdefaults__ or ()))
+
+
+def function_signatures_match(f, g):
+    """
+    Returns whether the signatures of `f` and `g` are compatible. Results for
+    plain functions are memoized on their code objects, so repeatedly stubbing
+    the same targets with functions created by the same factory skips
+    introspection.
+    """
+    fkey = _signature_cache_key(f)
+    gkey = _signature_cache_key(g)
+    if fkey is None or gkey is None:
+        return _uncached_function_signatures_match(f, g)
+    key = (fkey, gkey)
+    if key not in _signature_match_cache:
+        if len(_signature_match_cache) >= _MAX_CACHED_SIGNATURE_MATCHES:
+            _signature_match_cache.clear()
+        _signature_match_cache[key] = _uncached_function_signatures_match(f, g)
+    return _signature_match_cache[key]
+
+
 def is_wrapped_function(f: Callable) -> bool:
     return hasattr(f, "__wrapped__")
@@ -0,0 +1,30 @@
+from functools import partial
+
+from sample_code.other_package import write_to_disk
+
+
+def _make_saver():
+    save = write_to_disk
+
+    def saver(x):
+        return save(x)
+
+    return saver
+
+
+save_with_closure = _make_saver()
+save_with_partial = partial(write_to_disk)
+handlers = {"save": write_to_disk}
+
+
+def save_with_default(x, save=write_to_disk):
+    return save(x)
+
+
+def save_with_kwdefault(x, *, save=write_to_disk):
+    return save(x)
+
+
+class Saver:
+    save = staticmethod(write_to_disk)
+    handlers = {"save": write_to_disk}
@@ -15,3 +15,53 @@ def write_to_disk(x):
 
 def dangerous_function():
     raise Exception("This is what happens when you don't floss!")
+
+
+def add_item(items, item):
+    items.append(item)
+    return items
+
+
+async def fetch(x):
+    return {"fetched": x}
+
+
+async def dangerous_fetch(x):
+    raise Exception("This is what happens when you don't floss!")
+
+
+def count_up_to(n):
+    for i in range(n):
+        yield i
+    return "done"
+
+
+def count_up_to_then_fail(n):
+    yield from range(n)
+    raise Exception("This is what happens when you don't floss!")
+
+
+class Account:
+    def __init__(self, balance):
+        self.balance = balance
+
+    def deposit(self, amount):
+        self.balance += amount
+        return self.balance
+
+    @classmethod
+    def empty(cls):
+        return cls(0)
+
+    @staticmethod
+    def is_valid_amount(amount):
+        return amount > 0
+
+    @property
+    def overdrawn(self):
+        return self.balance < 0
+
+
+class SavingsAccount(Account):
+    def add_interest(self, rate):
+        return self.deposit(self.balance * rate)
@@ -1,16 +1,22 @@
 import pytest
 
+import pybond.call_log
 import sample_code.my_module as my_module
 import sample_code.other_package as other_package
 from pybond import (
     called_exactly_once_with_args,
     called_with_args,
     called_with_exact_args_list,
+    called_within,
+    calls,
+    column,
+    latency,
     spy,
     stub,
     times_called,
     was_called,
 )
+from pybond.james import call_log
 
 
 def test_was_called():
@@ -209,3 +215,184 @@ def test_called_with_exact_args_list():
                 {"y": "giraffe"},
             ],
         )
+
+
+def test_called_with_args_uses_an_index_of_retained_calls():
+    with spy(other_package.write_to_disk, max_calls=2):
+        other_package.write_to_disk({"a": 1})
+        assert called_with_args(other_package.write_to_disk, args=[{"a": 1}])
+        other_package.write_to_disk(2)
+        other_package.write_to_disk(3)
+        assert not called_with_args(
+            other_package.write_to_disk,
+            args=[{"a": 1}],
+        )
+        assert called_with_args(other_package.write_to_disk, args=[3])
+
+
+def test_called_with_args_supports_unhashable_args():
+    with spy(other_package.write_to_disk):
+        other_package.write_to_disk([1, 2])
+        other_package.write_to_disk({"a": [1, 2]})
+        assert called_with_args(other_package.write_to_disk, args=[[1, 2]])
+        assert called_with_args(
+            other_package.write_to_disk,
+            args=[{"a": [1, 2]}],
+        )
+        assert not called_with_args(
+            other_package.write_to_disk,
+            args=[{"a": [1]}],
+        )
+
+
+def test_called_within():
+    with spy(other_package.write_to_disk, timing=True):
+        assert not called_within(other_package.write_to_disk, 10**9)
+        other_package.write_to_disk(1)
+        [fcall] = calls(other_package.write_to_disk)
+        assert fcall.start_ns is not None
+        assert fcall.duration_ns >= 0
+        assert latency(other_package.write_to_disk).count == 1
+        assert called_within(other_package.write_to_disk, 10**9)
+        assert not called_within(other_package.write_to_disk, -1)
+
+
+def test_calls_are_not_timed_by_default():
+    with spy(other_package.write_to_disk):
+        other_package.write_to_disk(1)
+        [fcall] = calls(other_package.write_to_disk)
+        assert fcall.start_ns is None
+        assert fcall.duration_ns is None
+        assert not hasattr(fcall, "__dict__")
+        with pytest.raises(ValueError):
+            latency(other_package.write_to_disk)
+
+
+def test_counting_spies():
+    with spy(other_package.dangerous_function, record="count"):
+        assert not was_called(other_package.dangerous_function)
+        my_module.try_dangerous_things()
+        my_module.try_dangerous_things()
+        assert was_called(other_package.dangerous_function)
+        assert times_called(other_package.dangerous_function, 2)
+        assert call_log(other_package.dangerous_function).errors == 2
+        for assertion in [
+            lambda: called_with_args(other_package.dangerous_function, args=[]),
+            lambda: called_exactly_once_with_args(
+                other_package.dangerous_function,
+                args=[],
+            ),
+            lambda: calls(other_package.dangerous_function),
+        ]:
+            with pytest.raises(ValueError) as e:
+                assertion()
+            assert "record=\"count\"" in e.value.args[0]
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        pytest.param({"record": "everything"}),
+        pytest.param({"record": "count", "max_calls": 1}),
+        pytest.param({"record": "count", "sample_every": 2}),
+    ],
+)
+def test_counting_spies_options_must_be_valid(options):
+    with pytest.raises(ValueError):
+        with spy(other_package.dangerous_function, **options):
+            pass
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_columnar_spies(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(pybond.call_log, "_numpy", lambda: None)
+    elif pybond.call_log._numpy() is None:
+        pytest.skip("NumPy is not installed")
+    with spy(other_package.make_a_network_request, record="columnar"):
+        for i in range(1, 6):
+            my_module.foo(i)
+        my_module.foo(2.5)
+        assert times_called(other_package.make_a_network_request, 6)
+        assert called_with_args(
+            other_package.make_a_network_request,
+            args=[2.5],
+            kwargs={"y": None},
+        )
+        x = column(other_package.make_a_network_request, 0)
+        assert not x.is_numeric
+        assert x.values == [1, 2, 3, 4, 5, 2.5]
+        assert x.sum() == 17.5
+        assert x.within(1, 5)
+        assert not x.within(low=2)
+        assert x.distinct() == 6
+        assert column(other_package.make_a_network_request, "y").values == [
+            None
+        ] * 6
+        assert column(other_package.make_a_network_request, "z").values == [
+            None
+        ] * 6
+        returns = column(other_package.make_a_network_request, "return")
+        assert returns.max() == 5
+
+    with spy(other_package.add_item, record="columnar"):
+        for i in range(1000):
+            other_package.add_item([], i % 10)
+        item = column(other_package.add_item, 1)
+        assert item.is_numeric
+        assert item.sum() == 4500
+        assert item.min() > -1 and item.max() == 9
+        assert item.distinct() == 10
+        assert list(item.values) == [i % 10 for i in range(1000)]
+        assert calls(other_package.add_item)[3] == {
+            "args": [[], 3],
+            "kwargs": None,
+            "error": None,
+            "return": [3],
+        }
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_columnar_sums_do_not_overflow(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(pybond.call_log, "_numpy", lambda: None)
+    elif pybond.call_log._numpy() is None:
+        pytest.skip("NumPy is not installed")
+    timestamps = [1_792_250_996_807_763_129 + i for i in range(10)]
+    with spy(other_package.add_item, record="columnar"):
+        for timestamp in timestamps:
+            other_package.add_item([], timestamp)
+        item = column(other_package.add_item, 1)
+        assert item.is_numeric
+        assert item.sum() == sum(timestamps)
+        assert item.mean() == sum(timestamps) / len(timestamps)
+
+
+def test_columnar_spies_record_errors():
+    with spy(other_package.dangerous_function, record="columnar"):
+        my_module.try_dangerous_things()
+        (fcall,) = calls(other_package.dangerous_function)
+        assert fcall["args"] is None
+        assert fcall["error"][0] is Exception
+        assert column(other_package.dangerous_function, "return").values == [
+            None
+        ]
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        pytest.param({"max_calls": 1}),
+        pytest.param({"threadsafe": True}),
+    ],
+)
+def test_columnar_spies_options_must_be_valid(options):
+    with pytest.raises(ValueError):
+        with spy(other_package.add_item, record="columnar", **options):
+            pass
+
+
+def test_column_requires_a_columnar_spy():
+    with spy(other_package.add_item):
+        with pytest.raises(ValueError):
+            column(other_package.add_item, 0)
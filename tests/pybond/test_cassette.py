@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+import sample_code.my_module_with_bound_imports as my_module_with_bound_imports
+import sample_code.other_package as other_package
+from pybond import calls, times_called
+from pybond.cassette import Cassette
+
+
+def _run_scenario():
+    return [
+        other_package.add_item([], 1),
+        other_package.add_item([0], 2),
+        other_package.add_item([], 1),
+        my_module_with_bound_imports.foo({"id": 1}),
+        list(other_package.count_up_to(3)),
+        my_module_with_bound_imports.try_dangerous_things().args,
+        asyncio.run(other_package.fetch(1)),
+    ]
+
+
+def _targets():
+    return [
+        other_package.add_item,
+        other_package.make_a_network_request,
+        other_package.count_up_to,
+        other_package.dangerous_function,
+        other_package.fetch,
+    ]
+
+
+def test_cassettes_replay_recorded_calls(tmp_path):
+    cassette = Cassette(tmp_path / "scenario.cassette")
+    assert not cassette.exists()
+    with cassette.record(*_targets()):
+        recorded = _run_scenario()
+    assert cassette.exists()
+    assert len(cassette) == 6
+
+    with cassette.replay(*_targets()):
+        assert _run_scenario() == recorded
+        # The real function would append to the list
+        items = []
+        assert other_package.add_item(items, 1) == [1]
+        assert items == []
+        assert times_called(other_package.add_item, 4)
+        assert calls(other_package.count_up_to)[0]["yields"] == [0, 1, 2]
+
+
+def test_cassettes_reject_calls_which_were_not_recorded(tmp_path):
+    cassette = Cassette(tmp_path / "scenario.cassette")
+    with cassette.record(other_package.add_item):
+        other_package.add_item([], 1)
+
+    with cassette.replay(other_package.add_item):
+        with pytest.raises(ValueError) as e:
+            other_package.add_item([], 2)
+        assert "is not in cassette" in e.value.args[0]
+
+    with cassette.replay(other_package.add_item, passthrough=True):
+        items = []
+        assert other_package.add_item(items, 2) == [2]
+        assert items == [2]
+
+
+def test_cassettes_are_not_written_when_recording_fails(tmp_path):
+    cassette = Cassette(tmp_path / "scenario.cassette")
+    with pytest.raises(ZeroDivisionError):
+        with cassette.record(other_package.add_item):
+            other_package.add_item([], 1)
+            1 / 0
+    assert not cassette.exists()
+
+
+def test_cassettes_must_be_valid(tmp_path):
+    path = tmp_path / "not_a.cassette"
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        with Cassette(path).replay(other_package.add_item):
+            pass
+
+
+def test_large_cassettes(tmp_path):
+    cassette = Cassette(tmp_path / "large.cassette")
+    with cassette.record(other_package.make_a_network_request):
+        for i in range(2000):
+            other_package.make_a_network_request(i, y=i % 7)
+    assert len(cassette) == 2000
+    with cassette.replay(other_package.make_a_network_request):
+        assert all(
+            other_package.make_a_network_request(i, y=i % 7) == i
+            for i in range(2000)
+        )
+
+
+def test_cassettes_match_calls_regardless_of_how_arguments_are_passed(
+    tmp_path,
+):
+    cassette = Cassette(tmp_path / "scenario.cassette")
+    with cassette.record(other_package.add_item):
+        other_package.add_item(items=[1], item=3)
+
+    with cassette.replay(other_package.add_item):
+        assert other_package.add_item(item=3, items=[1]) == [1, 3]
+        assert other_package.add_item([1], 3) == [1, 3]
+        assert other_package.add_item([1], item=3) == [1, 3]
+        with pytest.raises(ValueError):
+            other_package.add_item(item=[1], items=3)
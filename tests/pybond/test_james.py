@@ -1,12 +1,22 @@
+import asyncio
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 import pytest
 import time
 
 import sample_code.my_module as my_module
 import sample_code.other_package as other_package
 from tests.sample_code.mocks import create_mock_datetime
-from pybond import calls, spy, stub
+from pybond import (
+    calls,
+    spy,
+    stub,
+    times_called,
+    was_called,
+)
+from pybond.call_log import ThreadedCallLog
 from pybond.james import _instrumented_obj
+from pybond.types import FunctionCall
 
 
 def test_spied_function_throws_exception():
@@ -100,3 +110,272 @@ def test_instrumented_obj(original_obj, stub_obj, error_message):
         with pytest.raises(Exception) as e:
             _instrumented_obj(original_obj, stub_obj)
         assert error_message in e.value.args[0]
+
+
+@pytest.mark.parametrize(
+    "capture, expected_args",
+    [
+        pytest.param("none", None),
+        pytest.param("reference", [["a", "b"], "b"]),
+        pytest.param("shallow", [["a"], "b"]),
+        pytest.param("deep", [["a"], "b"]),
+        pytest.param(lambda args: len(args), 2),
+    ],
+)
+def test_spy_capture_policies(capture, expected_args):
+    with spy(other_package.add_item, capture=capture):
+        other_package.add_item(["a"], "b")
+        assert calls(other_package.add_item)[0]["args"] == expected_args
+
+
+def test_spy_capture_policy_must_be_supported():
+    with pytest.raises(ValueError) as e:
+        with spy(other_package.add_item, capture="everything"):
+            pass
+    assert e.value.args[0].startswith("Unsupported capture policy")
+
+
+def test_spy_max_calls():
+    with spy(other_package.write_to_disk, max_calls=2):
+        for i in range(5):
+            other_package.write_to_disk(i)
+        assert [c["args"] for c in calls(other_package.write_to_disk)] == [
+            [3],
+            [4],
+        ]
+        assert times_called(other_package.write_to_disk, 5)
+        assert was_called(other_package.write_to_disk)
+
+
+def test_spy_max_calls_must_be_positive():
+    with pytest.raises(ValueError) as e:
+        with spy(other_package.write_to_disk, max_calls=0):
+            pass
+    assert e.value.args[0].startswith("Invalid max_calls")
+
+
+def test_function_call_records():
+    record = FunctionCall([1], None, None, 2)
+    assert not hasattr(record, "__dict__")
+    assert record["args"] == [1]
+    assert record["return"] == 2
+    assert dict(record) == {
+        "args": [1],
+        "kwargs": None,
+        "error": None,
+        "return": 2,
+    }
+    assert record == {"args": [1], "kwargs": None, "error": None, "return": 2}
+    assert record != {"args": [1], "kwargs": None, "error": None, "return": 3}
+    assert record != {"args": [1], "kwargs": None, "error": None}
+    assert record == FunctionCall([1], None, None, 2)
+    with pytest.raises(KeyError):
+        record["returned"]
+
+
+def test_threadsafe_spy_merges_calls_from_all_threads():
+    def work(n):
+        for i in range(100):
+            other_package.write_to_disk((n, i))
+
+    with spy(other_package.write_to_disk, threadsafe=True):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(work, range(8)))
+        fcalls = calls(other_package.write_to_disk)
+        assert times_called(other_package.write_to_disk, 800)
+        assert len(fcalls) == 800
+        assert [fcall.seq for fcall in fcalls] == list(range(800))
+        for n in range(8):
+            assert [
+                fcall["args"][0][1]
+                for fcall in fcalls
+                if fcall["args"][0][0] == n
+            ] == list(range(100))
+
+
+def test_threadsafe_call_logs_count_every_record_kept_when_cleared():
+    log = ThreadedCallLog()
+    log.append(FunctionCall(None, None, None, None))
+    lock = log._lock
+
+    class AppendingLock:
+        # Lets a call be recorded whenever the lock is about to be taken, as
+        # another thread could
+        def __enter__(self):
+            log.append(FunctionCall(None, None, None, None))
+            lock.acquire()
+
+        def __exit__(self, *exc_info):
+            lock.release()
+
+    log._lock = AppendingLock()
+    log.clear()
+    log._lock = lock
+    assert len(log.records()) == log.total
+
+
+def test_spy_records_awaited_results_of_coroutine_functions():
+    async def run():
+        await other_package.fetch(1)
+        with pytest.raises(Exception):
+            await other_package.dangerous_fetch(2)
+
+    with spy(other_package.fetch, other_package.dangerous_fetch):
+        asyncio.run(run())
+        assert calls(other_package.fetch) == [
+            {
+                "args": [1],
+                "kwargs": None,
+                "return": {"fetched": 1},
+                "error": None,
+            },
+        ]
+        [dangerous_call] = calls(other_package.dangerous_fetch)
+        assert dangerous_call["return"] is None
+        assert dangerous_call["error"][1].args[0] == (
+            "This is what happens when you don't floss!"
+        )
+
+
+def test_stub_coroutine_functions():
+    async def fake_fetch(x):
+        return {"faked": x}
+
+    with stub((other_package.fetch, fake_fetch)):
+        assert asyncio.run(other_package.fetch(1)) == {"faked": 1}
+        assert calls(other_package.fetch)[0]["return"] == {"faked": 1}
+
+    with pytest.raises(ValueError) as e:
+        with stub((other_package.fetch, lambda x: {"faked": x})):
+            pass
+    assert e.value.args[0].startswith("Stub does not match the signature of")
+
+
+def test_spy_records_generator_items_as_they_are_consumed():
+    with spy(other_package.count_up_to):
+        generator = other_package.count_up_to(3)
+        assert times_called(other_package.count_up_to, 1)
+        assert next(generator) == 0
+        assert calls(other_package.count_up_to)[0]["yields"] == [0]
+        assert list(generator) == [1, 2]
+        assert calls(other_package.count_up_to) == [
+            {
+                "args": [3],
+                "kwargs": None,
+                "error": None,
+                "return": "done",
+                "yields": [0, 1, 2],
+            },
+        ]
+
+
+def test_spy_records_generator_errors():
+    with spy(other_package.count_up_to_then_fail):
+        with pytest.raises(Exception):
+            list(other_package.count_up_to_then_fail(2))
+        [fcall] = calls(other_package.count_up_to_then_fail)
+        assert fcall["yields"] == [0, 1]
+        assert fcall["error"][1].args[0] == (
+            "This is what happens when you don't floss!"
+        )
+
+
+def test_spied_generators_can_be_closed():
+    with spy(other_package.count_up_to):
+        generator = other_package.count_up_to(3)
+        next(generator)
+        generator.close()
+        [fcall] = calls(other_package.count_up_to)
+        assert fcall["yields"] == [0]
+        assert fcall["error"] is None
+
+
+def test_spy_sample_every():
+    with spy(other_package.write_to_disk, sample_every=10):
+        for i in range(100):
+            other_package.write_to_disk(i)
+        assert times_called(other_package.write_to_disk, 100)
+        assert [c["args"][0] for c in calls(other_package.write_to_disk)] == (
+            list(range(0, 100, 10))
+        )
+
+
+def test_spy_sample():
+    with spy(other_package.write_to_disk, sample=0.5):
+        for i in range(1000):
+            other_package.write_to_disk(i)
+        assert times_called(other_package.write_to_disk, 1000)
+        assert 0 < len(calls(other_package.write_to_disk)) < 1000
+
+
+@pytest.mark.parametrize(
+    "sampling, error_message",
+    [
+        pytest.param({"sample": 0}, "Invalid sample"),
+        pytest.param({"sample": 1.5}, "Invalid sample"),
+        pytest.param({"sample_every": 0}, "Invalid sample_every"),
+        pytest.param({"sample_every": 0.5}, "Invalid sample_every"),
+        pytest.param(
+            {"sample": 0.5, "sample_every": 2},
+            "sample and sample_every cannot be combined",
+        ),
+    ],
+)
+def test_spy_sampling_must_be_valid(sampling, error_message):
+    with pytest.raises(ValueError) as e:
+        with spy(other_package.write_to_disk, **sampling):
+            pass
+    assert e.value.args[0].startswith(error_message)
+
+
+def test_class_spying():
+    Account = other_package.Account
+    original_deposit = Account.deposit
+    with spy(Account):
+        a = Account.empty()
+        b = Account(5)
+        a.deposit(10)
+        b.deposit(1)
+        assert Account.is_valid_amount(3)
+        assert not a.overdrawn
+
+        assert times_called(Account.__init__, 2)
+        assert [fcall["args"] for fcall in calls(Account.__init__)] == [[0], [5]]
+        assert times_called(Account.empty, 1)
+        assert [fcall["return"] for fcall in calls(Account.deposit)] == [10, 6]
+        assert [fcall["return"] for fcall in calls(a.deposit)] == [10]
+        assert times_called(b.deposit, 1)
+        assert calls(b.deposit)[0]["args"] == [1]
+        assert calls(b.deposit)[0].receiver is b
+        assert calls(Account.is_valid_amount)[0]["args"] == [3]
+        assert calls(Account.overdrawn.fget)[0]["return"] is False
+    assert Account.deposit is original_deposit
+    assert not hasattr(Account.deposit, "calls")
+
+
+def test_class_spying_includes_inherited_methods():
+    SavingsAccount = other_package.SavingsAccount
+    with spy(SavingsAccount):
+        account = SavingsAccount(100)
+        account.add_interest(0.5)
+        assert times_called(account.add_interest, 1)
+        assert times_called(account.deposit, 1)
+        assert calls(account.deposit)[0]["return"] == 150
+    assert "deposit" not in vars(SavingsAccount)
+
+
+def test_class_spying_rejects_immutable_classes():
+    with pytest.raises(ValueError) as e:
+        with spy(datetime.datetime):
+            pass
+    assert e.value.args[0] == (
+        "Class datetime is immutable and its methods cannot be spied on by "
+        "pybond."
+    )
+
+
+def test_spying_on_a_method_through_its_class_is_rejected():
+    with pytest.raises(AttributeError):
+        with spy(other_package.Account.deposit):
+            pass
+    assert not hasattr(other_package, "deposit")
@@ -0,0 +1,98 @@
+import pytest
+
+import sample_code.my_module_with_bound_imports as my_module_with_bound_imports
+import sample_code.other_package as other_package
+from pybond import called_with_matching, spy
+from pybond.matchers import (
+    ANY,
+    Matcher,
+    compile_pattern,
+    has_entries,
+    instance_of,
+    satisfies,
+)
+
+
+@pytest.mark.parametrize(
+    "pattern, value, expected",
+    [
+        (ANY, object(), True),
+        (instance_of(int), 1, True),
+        (instance_of(int, str), "a", True),
+        (instance_of(int), "a", False),
+        (satisfies(lambda x: x > 0), 1, True),
+        (satisfies(lambda x: x > 0), -1, False),
+        (has_entries(a=1), {"a": 1, "b": 2}, True),
+        (has_entries({"a": instance_of(int)}), {"a": "1"}, False),
+        (has_entries(a=1), {"b": 2}, False),
+        (has_entries(a=1), [("a", 1)], False),
+        ([ANY, 2], [1, 2], True),
+        ([ANY, 2], [1, 2, 3], False),
+        ([ANY], (1,), False),
+        ({"a": ANY}, {"a": 1}, True),
+        ({"a": ANY}, {"a": 1, "b": 2}, False),
+        ([has_entries(x=[ANY, 1])], [{"x": [0, 1], "y": 2}], True),
+        ([1, {"a": 2}], [1, {"a": 2}], True),
+        ([1, {"a": 2}], [1, {"a": 3}], False),
+    ],
+)
+def test_compile_pattern(pattern, value, expected):
+    assert compile_pattern(pattern)(value) is expected
+
+
+def test_matchers_options_must_be_valid():
+    with pytest.raises(ValueError):
+        instance_of()
+    with pytest.raises(ValueError):
+        instance_of(1)
+    with pytest.raises(ValueError):
+        satisfies(42)
+
+
+def test_matchers_must_compile_to_a_predicate():
+    class Incomplete(Matcher):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_called_with_matching():
+    with spy(other_package.make_a_network_request):
+        assert not called_with_matching(other_package.make_a_network_request)
+        my_module_with_bound_imports.foo({"id": 1, "name": "x"})
+        assert called_with_matching(other_package.make_a_network_request)
+        assert called_with_matching(
+            other_package.make_a_network_request,
+            args=[has_entries(id=instance_of(int))],
+            kwargs={"y": None},
+        )
+        assert called_with_matching(
+            other_package.make_a_network_request,
+            kwargs=has_entries(y=ANY),
+        )
+        assert not called_with_matching(
+            other_package.make_a_network_request,
+            args=[has_entries(id=satisfies(lambda i: i > 1))],
+        )
+        assert not called_with_matching(
+            other_package.make_a_network_request,
+            args=[ANY, ANY],
+        )
+
+
+def test_called_with_matching_stops_at_the_first_match():
+    seen = []
+
+    def is_positive(x):
+        seen.append(x)
+        return x > 0
+
+    with spy(other_package.write_to_disk):
+        for i in range(5):
+            other_package.write_to_disk(i)
+        assert called_with_matching(
+            other_package.write_to_disk,
+            args=[satisfies(is_positive)],
+        )
+    assert seen == [0, 1]
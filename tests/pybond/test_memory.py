@@ -0,0 +1,169 @@
+import sys
+import types
+
+from pytest import MonkeyPatch
+
+import pybond.memory
+import sample_code.other_package as other_package
+import sample_code.my_module_with_bound_imports as my_module_with_bound_imports
+from pybond import stub
+from pybond.memory import (
+    BindingIndex,
+    binding_index,
+    replace_bound_references,
+)
+from pybond.tracker import is_import_tracker_installed, track_imports
+
+
+def test_binding_index_finds_bound_imports():
+    index = BindingIndex()
+    index.refresh()
+    bindings = index.lookup(other_package.write_to_disk)
+    assert (vars(other_package), "write_to_disk") in bindings
+    assert (vars(my_module_with_bound_imports), "write_to_disk") in bindings
+
+
+def test_binding_index_ignores_stale_bindings():
+    index = BindingIndex()
+    index.refresh()
+    with MonkeyPatch.context() as m:
+        m.setattr(other_package, "write_to_disk", lambda x: None)
+        bindings = index.lookup(other_package.write_to_disk)
+        assert bindings == []
+
+
+def test_binding_index_picks_up_newly_imported_modules():
+    index = BindingIndex()
+    index.refresh()
+    module = types.ModuleType("pybond_test_new_module")
+    module.__loader__ = None
+    module.write_to_disk = other_package.write_to_disk
+    with MonkeyPatch.context() as m:
+        m.setitem(sys.modules, module.__name__, module)
+        assert (vars(module), "write_to_disk") not in index.lookup(
+            other_package.write_to_disk
+        )
+        index.refresh()
+        assert (vars(module), "write_to_disk") in index.lookup(
+            other_package.write_to_disk
+        )
+
+
+def test_stubs_look_up_tracked_modules_in_the_index():
+    module = types.ModuleType("pybond_test_tracked_module")
+    module.__loader__ = None
+    module.handler = original = other_package.write_to_disk
+    index = BindingIndex()
+    with MonkeyPatch.context() as m:
+        m.setitem(sys.modules, module.__name__, module)
+        m.setattr(pybond.memory, "_binding_index", index)
+        index.track(module.__name__, vars(module))
+        with stub((other_package.write_to_disk, lambda x: "stubbed")):
+            assert module.handler(1) == "stubbed"
+        assert module.handler is original
+
+        # Tracked namespaces are not scanned again
+        module.late_handler = original
+        with stub((other_package.write_to_disk, lambda x: "stubbed")):
+            assert module.handler(1) == "stubbed"
+            assert module.late_handler is original
+
+        index.track(module.__name__, vars(module))
+        with stub((other_package.write_to_disk, lambda x: "stubbed")):
+            assert module.late_handler(1) == "stubbed"
+
+
+def test_bindings_patched_by_a_stub_are_kept_when_refreshing():
+    index = BindingIndex()
+    original = other_package.write_to_disk
+    with MonkeyPatch.context() as m:
+        m.setattr(pybond.memory, "_binding_index", index)
+        with stub((original, lambda x: "stubbed")):
+            index.refresh()
+        assert (vars(my_module_with_bound_imports), "write_to_disk") in (
+            index.lookup(original)
+        )
+
+
+def test_replace_bound_references():
+    original = other_package.write_to_disk
+    replacement = lambda x: "replaced"  # noqa: E731
+    with MonkeyPatch.context() as m:
+        replace_bound_references(m, [(original, replacement)])
+        assert other_package.write_to_disk is replacement
+        assert my_module_with_bound_imports.write_to_disk is replacement
+    assert other_package.write_to_disk is original
+    assert my_module_with_bound_imports.write_to_disk is original
+
+
+def test_import_tracker_indexes_modules_as_they_are_imported(tmp_path):
+    (tmp_path / "pybond_tracked_module.py").write_text(
+        "from sample_code.other_package import write_to_disk\n"
+    )
+    with MonkeyPatch.context() as m:
+        m.syspath_prepend(str(tmp_path))
+        m.delitem(sys.modules, "pybond_tracked_module", raising=False)
+        with track_imports():
+            import pybond_tracked_module
+        assert not is_import_tracker_installed()
+        assert (vars(pybond_tracked_module), "write_to_disk") in (
+            binding_index().lookup(other_package.write_to_disk)
+        )
+
+
+def test_stubs_find_names_rebound_without_resizing_the_namespace():
+    module = types.ModuleType("pybond_test_rebound_module")
+    module.__loader__ = None
+    module.handler = None
+    module.other_handler = None
+    with MonkeyPatch.context() as m:
+        m.setitem(sys.modules, module.__name__, module)
+        with stub((other_package.write_to_disk, lambda x: "stubbed")):
+            assert module.handler is None
+
+        module.handler = other_package.write_to_disk
+        with stub((other_package.write_to_disk, lambda x: "stubbed")):
+            assert module.handler(1) == "stubbed"
+
+        del module.other_handler
+        module.renamed_handler = other_package.write_to_disk
+        with stub((other_package.write_to_disk, lambda x: "stubbed")):
+            assert module.renamed_handler(1) == "stubbed"
+        assert module.renamed_handler is other_package.write_to_disk
+
+
+def test_stubs_use_the_bindings_recorded_at_import_time(tmp_path):
+    (tmp_path / "pybond_stubbed_tracked_module.py").write_text(
+        "from sample_code.other_package import write_to_disk\n"
+    )
+    index = BindingIndex()
+    lookups = []
+    lookup = index.lookup
+    with MonkeyPatch.context() as m:
+        m.syspath_prepend(str(tmp_path))
+        m.delitem(sys.modules, "pybond_stubbed_tracked_module", raising=False)
+        m.setattr(pybond.memory, "_binding_index", index)
+        m.setattr(
+            index,
+            "lookup",
+            lambda obj: lookups.append(obj) or lookup(obj),
+        )
+        with track_imports():
+            import pybond_stubbed_tracked_module as module
+        assert index.is_tracked(vars(module))
+        with stub((other_package.write_to_disk, lambda x: "stubbed")):
+            assert module.write_to_disk(1) == "stubbed"
+        assert lookups
+
+
+def test_import_tracker_does_not_modify_loaders(tmp_path):
+    (tmp_path / "pybond_tracked_loader_module.py").write_text("value = 1\n")
+    with MonkeyPatch.context() as m:
+        m.syspath_prepend(str(tmp_path))
+        m.delitem(sys.modules, "pybond_tracked_loader_module", raising=False)
+        with track_imports():
+            import pybond_tracked_loader_module
+        loader = pybond_tracked_loader_module.__loader__
+        assert "exec_module" not in vars(loader)
+        assert pybond_tracked_loader_module.__spec__.loader is loader
+        assert pybond_tracked_loader_module.value == 1
@@ -0,0 +1,64 @@
+import subprocess
+import sys
+
+import pytest
+
+import sample_code.other_package as other_package
+from pybond.patch import PatchJournal
+
+
+class Base:
+    attr = "base"
+
+
+class Derived(Base):
+    pass
+
+
+def test_patch_journal_undoes_setattr_in_reverse_order():
+    original = other_package.write_to_disk
+    with PatchJournal.context() as journal:
+        journal.setattr(other_package, "write_to_disk", 1)
+        journal.setattr(other_package, "write_to_disk", 2)
+        assert other_package.write_to_disk == 2
+    assert other_package.write_to_disk is original
+
+
+def test_patch_journal_removes_attributes_it_added():
+    with PatchJournal.context() as journal:
+        journal.setattr(other_package, "not_there", 1, raising=False)
+        journal.setattr(Derived, "attr", "derived")
+        assert Derived.attr == "derived"
+    assert not hasattr(other_package, "not_there")
+    assert "attr" not in vars(Derived)
+    assert Derived.attr == "base"
+
+
+def test_patch_journal_setattr_raises_on_missing_attributes():
+    with PatchJournal.context() as journal:
+        with pytest.raises(AttributeError):
+            journal.setattr(other_package, "not_there", 1)
+    assert not hasattr(other_package, "not_there")
+
+
+def test_patch_journal_undoes_setitem():
+    mapping = {"a": 1}
+    with PatchJournal.context() as journal:
+        journal.setitem(mapping, "a", 2)
+        journal.setitem(mapping, "b", 3)
+        assert mapping == {"a": 2, "b": 3}
+    assert mapping == {"a": 1}
+
+
+def test_importing_pybond_does_not_import_pytest_or_numpy():
+    code = (
+        "import sys, pybond; "
+        "print('pytest' in sys.modules or 'numpy' in sys.modules)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    assert output.strip() == "False"
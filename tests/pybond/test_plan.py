@@ -0,0 +1,109 @@
+import sys
+import types
+
+import pytest
+
+import pybond.james
+import sample_code.my_module_with_bound_imports as my_module_with_bound_imports
+import sample_code.my_module_with_indirect_references as my_module_with_indirect_references
+import sample_code.other_package as other_package
+from pybond import StubPlan, calls, spy, stub, times_called
+from tests.sample_code.mocks import mock_write_to_disk
+
+
+def test_stub_plan_can_be_applied_many_times(monkeypatch):
+    plan = StubPlan((other_package.write_to_disk, mock_write_to_disk))
+
+    def fail(*_):
+        raise AssertionError("The plan was compiled again")
+
+    monkeypatch.setattr(pybond.james, "_instrumented_obj", fail)
+    monkeypatch.setattr(pybond.james, "resolve_bindings", fail)
+
+    for i in range(3):
+        with plan.apply():
+            assert my_module_with_bound_imports.foo(i) == i
+            assert times_called(other_package.write_to_disk, 1)
+            assert calls(other_package.write_to_disk)[0]["args"] == [i]
+        assert not hasattr(other_package.write_to_disk, "calls")
+
+
+def test_stub_plan_is_invalidated_when_modules_are_imported():
+    plan = StubPlan.of_spies(other_package.write_to_disk)
+    module = types.ModuleType("pybond_test_plan_module")
+    module.__loader__ = None
+    module.write_to_disk = other_package.write_to_disk
+    with pytest.MonkeyPatch.context() as m:
+        m.setitem(sys.modules, module.__name__, module)
+        with plan.apply():
+            module.write_to_disk(42)
+            assert times_called(other_package.write_to_disk, 1)
+
+
+def test_stub_plan_is_invalidated_when_modules_are_replaced():
+    plan = StubPlan.of_spies(other_package.write_to_disk)
+    removed = types.ModuleType("pybond_test_plan_removed_module")
+    removed.__loader__ = None
+    module = types.ModuleType("pybond_test_plan_module")
+    module.__loader__ = None
+    module.write_to_disk = other_package.write_to_disk
+    with pytest.MonkeyPatch.context() as m:
+        m.setitem(sys.modules, removed.__name__, removed)
+        with plan.apply():
+            pass
+        # The number of modules is unchanged
+        m.delitem(sys.modules, removed.__name__)
+        m.setitem(sys.modules, module.__name__, module)
+        with plan.apply():
+            module.write_to_disk(42)
+            assert times_called(other_package.write_to_disk, 1)
+
+
+def test_stub_plan_validates_stubs_when_compiled():
+    with pytest.raises(ValueError) as e:
+        StubPlan((other_package.write_to_disk, lambda: None))
+    assert e.value.args[0].startswith("Stub does not match the signature of")
+
+
+def _save_through_every_reference(x):
+    return [
+        my_module_with_indirect_references.save_with_closure(x),
+        my_module_with_indirect_references.save_with_partial(x),
+        my_module_with_indirect_references.handlers["save"](x),
+        my_module_with_indirect_references.save_with_default(x),
+        my_module_with_indirect_references.save_with_kwdefault(x),
+        my_module_with_indirect_references.Saver.save(x),
+        my_module_with_indirect_references.Saver.handlers["save"](x),
+    ]
+
+
+def test_deep_stubs_rebind_indirect_references():
+    with stub(
+        (other_package.write_to_disk, lambda x: x),
+        deep=True,
+        scope=["sample_code"],
+    ):
+        assert _save_through_every_reference(42) == [42] * 7
+        assert times_called(other_package.write_to_disk, 7)
+    assert _save_through_every_reference(42) == [None] * 7
+
+
+def test_stubs_only_rebind_indirect_references_when_deep():
+    with stub((other_package.write_to_disk, lambda x: x)):
+        assert _save_through_every_reference(42) == [None] * 7
+
+
+def test_deep_stubs_only_traverse_their_scope():
+    with stub(
+        (other_package.write_to_disk, lambda x: x),
+        deep=True,
+        scope=["tests"],
+    ):
+        assert _save_through_every_reference(42) == [None] * 7
+
+
+def test_deep_spies_do_not_spy_on_themselves():
+    with spy(other_package.write_to_disk, deep=True):
+        assert _save_through_every_reference(42) == [None] * 7
+        assert calls(other_package.write_to_disk)[0]["args"] == [42]
+        assert times_called(other_package.write_to_disk, 7)
@@ -0,0 +1,93 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import sample_code.my_module_with_bound_imports as my_module_with_bound_imports
+import sample_code.other_package as other_package
+from pybond import called_with_args, calls, spy, stub, times_called
+from pybond.james import call_log
+
+pytestmark = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="Requires the fork start method",
+)
+
+
+def _fork_context():
+    return multiprocessing.get_context("fork")
+
+
+def test_spies_record_calls_made_in_pool_workers():
+    with spy(other_package.write_to_disk, processes=True):
+        other_package.write_to_disk(-1)
+        with _fork_context().Pool(2) as pool:
+            results = pool.map(my_module_with_bound_imports.bar, range(5))
+        assert results == [0, 1, 2, 3, 4]
+        assert times_called(other_package.write_to_disk, 6)
+        assert sorted(
+            fcall["args"][0] for fcall in calls(other_package.write_to_disk)
+        ) == [-1, 0, 1, 2, 3, 4]
+        assert called_with_args(other_package.write_to_disk, args=[3])
+
+
+def test_stubs_record_calls_made_in_process_pool_executor_workers():
+    with stub(
+        (other_package.dangerous_function, lambda: os.getpid()),
+        processes=True,
+    ):
+        with ProcessPoolExecutor(2, mp_context=_fork_context()) as executor:
+            futures = [
+                executor.submit(my_module_with_bound_imports.try_dangerous_things)
+                for _ in range(4)
+            ]
+            pids = {future.result() for future in futures}
+        assert os.getpid() not in pids
+        assert times_called(other_package.dangerous_function, 4)
+        assert {
+            fcall["return"] for fcall in calls(other_package.dangerous_function)
+        } == pids
+
+
+def test_errors_raised_in_children_are_recorded():
+    with spy(other_package.dangerous_function, processes=True):
+        process = _fork_context().Process(
+            target=my_module_with_bound_imports.try_dangerous_things
+        )
+        process.start()
+        process.join()
+        (fcall,) = calls(other_package.dangerous_function)
+        assert fcall["error"][0] is Exception
+        assert fcall["error"][1].args == (
+            "This is what happens when you don't floss!",
+        )
+
+
+def test_process_call_logs_are_reset_between_applications():
+    with spy(other_package.write_to_disk, processes=True):
+        spied = other_package.write_to_disk
+        process = _fork_context().Process(target=spied, args=(1,))
+        process.start()
+        process.join()
+        assert times_called(spied, 1)
+    assert call_log(spied)._collector is None
+
+
+def test_process_spies_options_must_be_valid():
+    with pytest.raises(ValueError):
+        with spy(other_package.write_to_disk, processes=True, record="count"):
+            pass
+
+
+def _consume_count_up_to(n):
+    return list(other_package.count_up_to(n))
+
+
+def test_generators_consumed_in_children_are_recorded():
+    with spy(other_package.count_up_to, processes=True):
+        with _fork_context().Pool(1) as pool:
+            assert pool.map(_consume_count_up_to, [2]) == [[0, 1]]
+        (fcall,) = calls(other_package.count_up_to)
+        assert fcall["yields"] == [0, 1]
+        assert fcall["return"] == "done"
@@ -0,0 +1,60 @@
+import sample_code.other_package as other_package
+from pybond.memory import binding_index
+
+pytest_plugins = ["pytester"]
+
+
+def test_plugin_installs_stubs_once_and_resets_call_logs(
+    pytester,
+    monkeypatch,
+):
+    monkeypatch.setenv("PYTEST_DISABLE_PLUGIN_AUTOLOAD", "1")
+    pytester.makepyfile(
+        """
+        import sample_code.other_package as other_package
+        import sample_code.my_module as my_module
+        from pybond import spy, times_called
+        from pybond.pytest_plugin import spy_fixture, stub_fixture
+        from tests.sample_code.mocks import mock_write_to_disk
+
+        disk = stub_fixture(
+            (other_package.write_to_disk, mock_write_to_disk),
+            scope="module",
+        )
+        spied_foo = spy_fixture(my_module.foo, scope="module")
+        plans = []
+
+
+        def test_first(disk, spied_foo):
+            plans.append(disk)
+            my_module.bar(1)
+            assert times_called(other_package.write_to_disk, 1)
+            assert times_called(my_module.foo, 1)
+
+
+        def test_second(disk, spied_foo):
+            plans.append(disk)
+            assert times_called(other_package.write_to_disk, 0)
+            my_module.bar(2)
+            assert times_called(my_module.foo, 1)
+            assert plans[0] is plans[1]
+
+
+        def test_binding_index(pybond_binding_index, monkeypatch):
+            assert pybond_binding_index.is_tracked(vars(my_module))
+            lookups = []
+            lookup = pybond_binding_index.lookup
+            monkeypatch.setattr(
+                pybond_binding_index,
+                "lookup",
+                lambda obj: lookups.append(obj) or lookup(obj),
+            )
+            with spy(my_module.foo):
+                my_module.bar(3)
+                assert times_called(my_module.foo, 1)
+            assert lookups == [my_module.foo]
+        """
+    )
+    result = pytester.runpytest_inprocess("-p", "pybond.pytest_plugin")
+    result.assert_outcomes(passed=3)
+    assert not binding_index().is_tracked(vars(other_package))
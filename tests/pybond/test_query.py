@@ -0,0 +1,78 @@
+import pytest
+
+import sample_code.other_package as other_package
+from pybond import spy
+from pybond.matchers import instance_of
+from pybond.query import query
+from sample_code.other_package import Account
+
+
+def test_query_operations():
+    with spy(other_package.write_to_disk):
+        for x in [1, "a", 2, "b", 3]:
+            other_package.write_to_disk(x)
+        q = query(other_package.write_to_disk)
+        assert q.count() == 5
+        assert q.exists()
+        ints = q.where(args=[instance_of(int)]).map(lambda c: c["args"][0])
+        assert list(ints) == [1, 2, 3]
+        assert ints.where(lambda x: x > 1).first() == 2
+        assert ints.where(lambda x: x > 3).first("none") == "none"
+        assert not ints.where(lambda x: x > 3).exists()
+        assert q.map(lambda c: c["args"][0]).group_by(type) == {
+            int: [1, 2, 3],
+            str: ["a", "b"],
+        }
+
+
+def test_queries_are_lazy():
+    seen = []
+
+    def record(x):
+        seen.append(x)
+        return x
+
+    with spy(other_package.write_to_disk):
+        for i in range(5):
+            other_package.write_to_disk(i)
+        q = query(other_package.write_to_disk).map(lambda c: record(c["args"][0]))
+        assert seen == []
+        assert q.where(lambda x: x > 0).first() == 1
+        assert seen == [0, 1]
+
+
+def test_exact_queries_use_the_call_log_index(monkeypatch):
+    with spy(other_package.write_to_disk):
+        for i in range(5):
+            other_package.write_to_disk(i % 2)
+        q = query(other_package.write_to_disk).where(args=[1])
+        assert q.count() == 2
+        monkeypatch.setattr(
+            type(q),
+            "__iter__",
+            lambda _: pytest.fail("The call log was scanned"),
+        )
+        assert q.count() == 2
+        assert q.exists()
+
+
+def test_queries_of_bound_methods_filter_by_instance():
+    with spy(Account):
+        a, b = Account(0), Account(0)
+        a.deposit(1)
+        b.deposit(2)
+        b.deposit(3)
+        assert query(Account.deposit).count() == 3
+        assert query(b.deposit).count() == 2
+        assert query(b.deposit).map(lambda c: c["args"]).first() == [2]
+
+
+def test_query_args_filters_must_come_before_map():
+    with spy(other_package.write_to_disk):
+        with pytest.raises(ValueError):
+            query(other_package.write_to_disk).map(str).where(args=[1])
+
+
+def test_query_of_function_not_spied():
+    with pytest.raises(ValueError):
+        query(other_package.write_to_disk)
@@ -0,0 +1,128 @@
+import pytest
+
+import sample_code.my_module as my_module
+import sample_code.other_package as other_package
+from pybond import called_with_args, calls, spy, times_called
+from pybond.sinks import BinarySink, CallSink, JsonLinesSink
+
+
+@pytest.mark.parametrize("sink_class", [JsonLinesSink, BinarySink])
+def test_spy_streams_calls_to_a_sink(tmp_path, sink_class):
+    sink = sink_class(tmp_path / "calls")
+    with spy(other_package.write_to_disk, sink=sink):
+        other_package.write_to_disk({"a": 1})
+        other_package.write_to_disk(2)
+        fcalls = calls(other_package.write_to_disk)
+        assert not isinstance(fcalls, list)
+        assert list(fcalls) == [
+            {"args": [{"a": 1}], "kwargs": None, "error": None, "return": None},
+            {"args": [2], "kwargs": None, "error": None, "return": None},
+        ]
+        assert times_called(other_package.write_to_disk, 2)
+        assert called_with_args(other_package.write_to_disk, args=[2])
+    assert list(sink.read())[1]["args"] == [2]
+
+
+def test_spy_accepts_a_path_as_sink(tmp_path):
+    path = tmp_path / "calls.bin"
+    with spy(other_package.dangerous_function, sink=path):
+        my_module.try_dangerous_things()
+        [fcall] = calls(other_package.dangerous_function)
+        assert fcall["error"][0] is Exception
+    assert path.stat().st_size > 0
+    assert not path.read_bytes().startswith(b"{")
+
+
+def test_json_lines_sink_keeps_its_format(tmp_path):
+    path = tmp_path / "calls.jsonl"
+    with spy(other_package.dangerous_function, sink=JsonLinesSink(path)):
+        my_module.try_dangerous_things()
+        [fcall] = calls(other_package.dangerous_function)
+        assert fcall["error"] == [
+            "Exception",
+            "This is what happens when you don't floss!",
+        ]
+    assert path.read_text().count("\n") == 1
+
+
+@pytest.mark.parametrize("sink_class", [JsonLinesSink, BinarySink])
+def test_sink_assertions_compare_values_as_written(tmp_path, sink_class):
+    with spy(other_package.write_to_disk, sink=sink_class(tmp_path / "calls")):
+        other_package.write_to_disk((1, 2))
+        other_package.write_to_disk({1: "a"})
+        assert called_with_args(other_package.write_to_disk, args=[(1, 2)])
+        assert called_with_args(other_package.write_to_disk, args=[{1: "a"}])
+        assert not called_with_args(other_package.write_to_disk, args=[(2, 1)])
+
+
+def test_paths_are_written_as_binary(tmp_path):
+    with spy(other_package.write_to_disk, sink=tmp_path / "calls"):
+        other_package.write_to_disk((1, 2))
+        [fcall] = calls(other_package.write_to_disk)
+        assert fcall["args"] == [(1, 2)]
+
+
+def test_binary_sink_keeps_picklable_errors(tmp_path):
+    sink = BinarySink(tmp_path / "calls")
+    with spy(other_package.dangerous_function, sink=sink):
+        my_module.try_dangerous_things()
+        [fcall] = calls(other_package.dangerous_function)
+        assert fcall["error"][0] is Exception
+        assert fcall["error"][1].args[0] == (
+            "This is what happens when you don't floss!"
+        )
+
+
+def test_sinks_must_implement_their_encoding(tmp_path):
+    class HalfSink(CallSink):
+        def _encode(self, record):
+            return b""
+
+    with pytest.raises(TypeError):
+        HalfSink(tmp_path / "calls")
+    assert not (tmp_path / "calls").exists()
+
+
+@pytest.mark.parametrize("shared", [False, True])
+def test_sink_cannot_be_shared_by_several_targets(tmp_path, shared):
+    sink = BinarySink(tmp_path / "calls") if shared else tmp_path / "calls"
+    with pytest.raises(ValueError) as e:
+        with spy(
+            other_package.add_item,
+            other_package.write_to_disk,
+            sink=sink,
+        ):
+            pass
+    assert "single target" in str(e.value)
+
+
+def test_sink_cannot_be_combined_with_max_calls(tmp_path):
+    with pytest.raises(ValueError) as e:
+        with spy(
+            other_package.write_to_disk,
+            sink=tmp_path / "calls.jsonl",
+            max_calls=10,
+        ):
+            pass
+    assert e.value.args[0].startswith("max_calls cannot be combined")
+
+
+@pytest.mark.parametrize("sink_class", [JsonLinesSink, BinarySink])
+def test_sinks_record_generators_once_they_are_complete(tmp_path, sink_class):
+    sink = sink_class(tmp_path / "calls")
+    with spy(other_package.count_up_to, sink=sink):
+        assert list(other_package.count_up_to(3)) == [0, 1, 2]
+        generator = other_package.count_up_to(5)
+        next(generator)
+        assert [c["yields"] for c in calls(other_package.count_up_to)] == [
+            [0, 1, 2]
+        ]
+        generator.close()
+        unconsumed = other_package.count_up_to(2)  # noqa: F841
+        assert [
+            (c["yields"], c["return"])
+            for c in calls(other_package.count_up_to)
+        ] == [([0, 1, 2], "done"), ([0], None)]
+    assert [
+        (c["yields"], c["return"]) for c in sink.read()
+    ] == [([0, 1, 2], "done"), ([0], None), ([], None)]
@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from pybond.stats import LatencyHistogram
+
+
+def test_latency_histogram_percentiles():
+    histogram = LatencyHistogram()
+    durations = [random.randrange(1, 10_000_000) for _ in range(10_000)]
+    for duration in durations:
+        histogram.add(duration)
+    durations.sort()
+    assert histogram.count == 10_000
+    assert histogram.min_ns == durations[0]
+    assert histogram.max_ns == durations[-1]
+    assert histogram.percentile(100) == durations[-1]
+    for p in [50, 90, 99]:
+        exact = durations[int(p / 100 * len(durations)) - 1]
+        assert exact <= histogram.percentile(p) <= exact * 1.07
+
+
+def test_latency_histogram_merge():
+    a = LatencyHistogram()
+    b = LatencyHistogram()
+    for duration in [1, 2, 3]:
+        a.add(duration)
+    for duration in [100, 200]:
+        b.add(duration)
+    merged = a.merge(b)
+    assert merged.summary() == {
+        "count": 5,
+        "min_ns": 1,
+        "mean_ns": 61.2,
+        "p50_ns": 3,
+        "p90_ns": 200,
+        "p99_ns": 200,
+        "max_ns": 200,
+    }
+
+
+def test_latency_histogram_percentile_must_be_valid():
+    assert LatencyHistogram().percentile(50) is None
+    with pytest.raises(ValueError):
+        LatencyHistogram().percentile(0)
@@ -2,6 +2,7 @@ import builtins
 import pytest
 import time
 
+import pybond.util
 from pybond.util import _fn_with_zero_arguments, function_signatures_match
 
 
@@ -241,6 +242,26 @@ def test_var_kwargs_match(f, g, varkwargs_matching):
     assert function_signatures_match(f, g) == varkwargs_matching
 
 
+async def _async_fn(_):
+    return None
+
+
+async def _other_async_fn(_):
+    return None
+
+
+@pytest.mark.parametrize(
+    "f, g, coroutine_functions_matching",
+    [
+        pytest.param(_async_fn, _other_async_fn, True),
+        pytest.param(_async_fn, lambda _: None, False),
+        pytest.param(lambda _: None, _async_fn, False),
+    ],
+)
+def test_coroutine_functions_match(f, g, coroutine_functions_matching):
+    assert function_signatures_match(f, g) == coroutine_functions_matching
+
+
 @pytest.mark.parametrize(
     "f, g, is_special_case",
     [
@@ -264,3 +285,16 @@ def test_function_signatures_match_for_unsupported_callable_special_cases(
 def test_executing_model_functions():
     # Execute these functions just to make sure code coverage is exhaustive
     assert _fn_with_zero_arguments() == None
+
+
+def test_function_signatures_match_is_memoized(monkeypatch):
+    def make_stub():
+        return lambda x, *, y=None: None
+
+    assert function_signatures_match(make_stub(), make_stub())
+
+    def fail(_):
+        raise AssertionError("Signature was introspected again")
+
+    monkeypatch.setattr(pybond.util, "getfullargspec", fail)
+    assert function_signatures_match(make_stub(), make_stub())